@@ -3,6 +3,7 @@
 import sys
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from workflow.context import WorkflowContext
@@ -25,8 +26,8 @@ logger = logging.getLogger('ak2md-workflow')
 class Workflow:
     """Main workflow orchestrator"""
     
-    def __init__(self, workspace_dir: str):
-        self.context = WorkflowContext(Path(workspace_dir))
+    def __init__(self, workspace_dir: str, max_workers: int = None, incremental: bool = False):
+        self.context = WorkflowContext(Path(workspace_dir), max_workers=max_workers, incremental=incremental)
         
         # Define special files to process
         special_files = [
@@ -66,21 +67,53 @@ class Workflow:
             ValidationStage("validate", self.context)
         ]
     
+    @property
+    def stages(self):
+        return self._stages
+    
+    @stages.setter
+    def stages(self, stages):
+        # Keep the name -> position index in sync when the stage list is replaced (e.g. --skip-validation)
+        self._stages = list(stages)
+        self._stage_index = {stage.name: i for i, stage in enumerate(self._stages)}
+    
     def run(self, start_stage=None) -> bool:
         """Run the workflow, optionally starting from a specific stage"""
         
         start_idx = 0
         if start_stage:
-            try:
-                start_idx = next(i for i, stage in enumerate(self.stages) 
-                               if stage.name == start_stage)
-            except StopIteration:
+            start_idx = self._stage_index.get(start_stage)
+            if start_idx is None:
                 logger.error(f"Invalid stage name: {start_stage}")
                 return False
         
-        for stage in self.stages[start_idx:]:
-            if not stage.execute():
+        # Stages before the start stage are assumed to have completed in an earlier run
+        done = {stage.name for stage in self.stages[:start_idx]}
+        pending = list(self.stages[start_idx:])
+        return self._run_stages(pending, done)
+    
+    def _run_stages(self, pending, done) -> bool:
+        """Run stages as their dependencies complete; independent stages run concurrently"""
+        while pending:
+            ready = [stage for stage in pending if all(dep in done for dep in stage.depends_on)]
+            if not ready:
+                logger.error(f"Unsatisfiable stage dependencies: {[stage.name for stage in pending]}")
                 return False
+            for stage in ready:
+                pending.remove(stage)
+            
+            # A lone ready stage runs on the main thread so Ctrl+C interrupts it right away
+            # and its process pools are started from the main thread
+            if len(ready) == 1:
+                results = [ready[0].execute()]
+            else:
+                with ThreadPoolExecutor(max_workers=len(ready)) as executor:
+                    results = list(executor.map(lambda stage: stage.execute(), ready))
+            
+            for stage, result in zip(ready, results):
+                if not result:
+                    return False
+                done.add(stage.name)
         
         return True
 
@@ -95,6 +128,10 @@ def main():
                        help='Enable debug logging')
     parser.add_argument('--skip-validation', action='store_true',
                        help='Skip validation stage')
+    parser.add_argument('--max-workers', type=int, default=None,
+                       help='Number of worker processes used to convert HTML files and restructure markdown (default: CPU count, 1 disables parallelism)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only convert HTML files that changed since their markdown was last generated, and reuse the restructured output of unchanged files')
     
     args = parser.parse_args()
     
@@ -105,7 +142,7 @@ def main():
         logging.getLogger('ak2md-workflow.stages').setLevel(logging.DEBUG)
         logging.getLogger('ak2md-workflow.processors').setLevel(logging.DEBUG)
     
-    workflow = Workflow(args.workspace)
+    workflow = Workflow(args.workspace, max_workers=args.max_workers, incremental=args.incremental)
     
     if args.skip_validation:
         workflow.stages = [s for s in workflow.stages if s.name != "validate"]
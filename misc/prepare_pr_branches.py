@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Configuration
@@ -25,13 +28,52 @@ VERSIONS_CONFIG = [
 def get_dir_suffix(version):
     return version.replace(".", "")
 
-def run_git_cmd(repo_path, args, check=True):
-    """Run a git command in the specified repo."""
-    cmd = ["git"] + args
+def stage_content(source_content_dir, scratch_dir):
+    """Copy a version's content into its scratch dir (runs in a worker process)."""
+    shutil.copytree(source_content_dir, scratch_dir)
+    return scratch_dir
+
+def stage_all_versions(kafka_site_repo, scratch_root):
+    """Copy the content of every configured version into scratch dirs in parallel.
+
+    The git operations have to run one version at a time against the shared kafka
+    working tree, but the copies don't, so they are done up front and each version's
+    docs are later moved into place instead of copied.
+    """
+    jobs = {}
+    for config in VERSIONS_CONFIG:
+        version = config if isinstance(config, str) else config["version"]
+        dir_suffix = get_dir_suffix(version)
+        source_content_dir = kafka_site_repo / "content" / "en" / dir_suffix
+        if source_content_dir.exists():
+            jobs[version] = (source_content_dir, scratch_root / dir_suffix)
+
+    print(f"Staging content for {len(jobs)} versions in {scratch_root}...")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {version: executor.submit(stage_content, src, dst) for version, (src, dst) in jobs.items()}
+        return {version: future.result() for version, future in futures.items()}
+
+def move_staged_content(staged_dir, docs_dir):
+    """Move staged content into docs, merging into directories that were preserved."""
+    for item in staged_dir.iterdir():
+        target = docs_dir / item.name
+        if target.exists():
+            shutil.copytree(item, target, dirs_exist_ok=True)
+        else:
+            shutil.move(str(item), str(target))
+
+def run_git_cmd(repo_path, args, check=True, read_only=False):
+    """Run a git command in the specified repo.
+
+    read_only commands skip optional locks (e.g. the index refresh done by status).
+    """
+    cmd = ["git", "-C", str(repo_path)]
+    if read_only:
+        cmd.append("--no-optional-locks")
+    cmd += args
     print(f"   [CMD] {' '.join(cmd)}")
     result = subprocess.run(
         cmd, 
-        cwd=repo_path, 
         capture_output=True, 
         text=True
     )
@@ -41,7 +83,36 @@ def run_git_cmd(repo_path, args, check=True):
         sys.exit(1)
     return result
 
+def list_refs(repo_path):
+    """Return the set of local and remote-tracking branch refs in the repo, from a single git call."""
+    res = run_git_cmd(repo_path, ["for-each-ref", "--format=%(refname)", "refs/heads", "refs/remotes"],
+                      read_only=True)
+    return set(res.stdout.split())
+
+def resolve_upstream_ref(refs, upstream_branch):
+    """Pick upstream/{branch}, then origin/{branch}, then local {branch}, whichever exists in refs."""
+    candidates = [
+        (f"refs/remotes/upstream/{upstream_branch}", f"upstream/{upstream_branch}"),
+        (f"refs/remotes/origin/{upstream_branch}", f"origin/{upstream_branch}"),
+        (f"refs/heads/{upstream_branch}", upstream_branch),
+    ]
+    for ref, name in candidates:
+        if ref in refs:
+            return name
+    # Not a known branch; let checkout resolve it (tag, commit, ...) and fail loudly otherwise
+    return upstream_branch
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Prepare kafka docs branches (d-<version>) from kafka-site content")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="Batch mode: commit each branch with the suggested message instead of pausing between versions")
+    parser.add_argument("--skip-missing", action="store_true",
+                        help="Skip versions whose source content directory is missing instead of prompting")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     # Resolve paths relative to this script location
     # Script is in <root>/misc/prepare_pr_branches.py
     script_path = Path(__file__).resolve()
@@ -65,6 +136,23 @@ def main():
         print(f"Error: Kafka site repo not found at {kafka_site_repo}")
         sys.exit(1)
 
+    # Stage next to the kafka repo so moving into docs is a rename on the same filesystem
+    scratch_root = Path(tempfile.mkdtemp(prefix=".prepare-pr-branches-", dir=workspace_root))
+    try:
+        staged_dirs = stage_all_versions(kafka_site_repo, scratch_root)
+        process_versions(kafka_repo, kafka_site_repo, staged_dirs, args)
+    finally:
+        shutil.rmtree(scratch_root, ignore_errors=True)
+
+    print("All versions processed!")
+
+def process_versions(kafka_repo, kafka_site_repo, staged_dirs, args):
+    # Fetch once and snapshot the branch refs; the only refs that change while
+    # processing are the d-{ver} branches, which are tracked in the set below
+    print(" > Updating Kafka repo...")
+    run_git_cmd(kafka_repo, ["fetch", "--all", "--quiet"], check=False)
+    refs = list_refs(kafka_repo)
+    
     for config in VERSIONS_CONFIG:
         # Handle mixed types if necessary, but here we enforce dicts for consistency
         if isinstance(config, str):
@@ -78,35 +166,23 @@ def main():
         print(f"Processing version: {version} (Upstream: {upstream_branch}, Content dir: {dir_suffix})")
         
         # 1. Update Kafka Repo
-        print(" > Updating Kafka repo...")
-        
-        # Fetch all
-        run_git_cmd(kafka_repo, ["fetch", "--all", "--quiet"], check=False)
-        
         # Checkout upstream branch
-        # Try upstream/{upstream_branch}, then origin/{upstream_branch}, then local {upstream_branch}
-        print(f" > Checking out upstream/{upstream_branch}...")
-        res = run_git_cmd(kafka_repo, ["checkout", f"upstream/{upstream_branch}"], check=False)
-        if res.returncode != 0:
-            print(f"   'upstream/{upstream_branch}' failed, trying 'origin/{upstream_branch}'...")
-            res = run_git_cmd(kafka_repo, ["checkout", f"origin/{upstream_branch}"], check=False)
-            if res.returncode != 0:
-                print(f"   'origin/{upstream_branch}' failed, trying local '{upstream_branch}'...")
-                # Note: If local branch exists but tracks something else, this might be just switching to it.
-                # Assuming this is what we want if remotes fail.
-                run_git_cmd(kafka_repo, ["checkout", upstream_branch]) # Fail if this also fails
+        # Prefer upstream/{upstream_branch}, then origin/{upstream_branch}, then local {upstream_branch}
+        upstream_ref = resolve_upstream_ref(refs, upstream_branch)
+        print(f" > Checking out {upstream_ref}...")
+        run_git_cmd(kafka_repo, ["checkout", upstream_ref]) # Fail if this fails
 
         # Create new local branch d-{ver} (still based on version number)
         branch_name = f"d-{version}"
         print(f" > Creating/Resetting branch {branch_name}...")
         
         # Check if branch exists
-        res = run_git_cmd(kafka_repo, ["show-ref", "--verify", "--quiet", f"refs/heads/{branch_name}"], check=False)
-        if res.returncode == 0:
+        if f"refs/heads/{branch_name}" in refs:
             print(f"   Branch {branch_name} exists. Deleting it first...")
             run_git_cmd(kafka_repo, ["branch", "-D", branch_name])
         
         run_git_cmd(kafka_repo, ["checkout", "-b", branch_name])
+        refs.add(f"refs/heads/{branch_name}")
         
         # 2. File Operations
         print(" > Updating documentation content...")
@@ -129,6 +205,9 @@ def main():
         source_content_dir = kafka_site_repo / "content" / "en" / dir_suffix
         if not source_content_dir.exists():
             print(f"   [WARNING] Source content directory not found: {source_content_dir}")
+            if args.skip_missing:
+                print("   Skipping (--skip-missing)")
+                continue
             choice = input("   Skip this version? (y/n): ")
             if choice.lower() == 'y':
                 continue
@@ -136,14 +215,14 @@ def main():
                 print("   Exiting...")
                 sys.exit(1)
         
-        print(f"   Copying content from {source_content_dir} to {docs_dir}...")
-        shutil.copytree(source_content_dir, docs_dir, dirs_exist_ok=True)
+        print(f"   Moving staged content from {source_content_dir} to {docs_dir}...")
+        move_staged_content(staged_dirs[version], docs_dir)
         
         print(f" > Done for version {version}.")
         print("-" * 40)
         
         # Show status
-        run_git_cmd(kafka_repo, ["status", "--short"], check=False)
+        run_git_cmd(kafka_repo, ["status", "--short"], check=False, read_only=True)
         print("-" * 40)
         
         # 3. Interactive Pause
@@ -151,6 +230,19 @@ def main():
         print("You can now inspect the changes, commit, and push PR.")
         print(f"Suggested: cd {kafka_repo} && git add . && git commit -m \"Sync docs for {version}\"")
         print("")
+        if args.yes:
+            # Commit on the branch so the next checkout starts from a clean tree
+            print(f" > Committing docs for {version} (--yes)...")
+            run_git_cmd(kafka_repo, ["add", "."])
+            staged = run_git_cmd(kafka_repo, ["diff", "--cached", "--quiet"], check=False)
+            if staged.returncode == 0:
+                print(f" > No changes to commit for {version}.")
+            else:
+                # A failed commit (hook, identity, signing) must stop the batch rather than
+                # carry the staged docs into the next version's checkout
+                run_git_cmd(kafka_repo, ["commit", "--quiet", "-m", f"Sync docs for {version}"])
+            print("-" * 40)
+            continue
         try:
             input("Press Enter to proceed to the next version (or Ctrl+C to stop)...")
         except KeyboardInterrupt:
@@ -158,7 +250,5 @@ def main():
             sys.exit(0)
         print("-" * 40)
 
-    print("All versions processed!")
-
 if __name__ == "__main__":
     main()
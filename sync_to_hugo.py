@@ -8,26 +8,89 @@ This script syncs the generated markdown output to the Hugo site with different
 """
 
 import argparse
+import errno
 import os
+import pickle
 import shutil
+import stat
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import yaml
-from typing import List, Set
+from typing import List, Optional, Set
+
+# Number of threads used to copy files within a merged directory
+FILE_COPY_WORKERS = 16
+
+# Parsed process.yaml is cached here, keyed on the file's path, mtime and size
+CONFIG_CACHE_FILE = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'ak2md' / 'process.pkl'
+
+try:
+    import fcntl
+    # FICLONE ioctl from linux/fs.h: share the source's extents instead of copying bytes
+    _FICLONE = 0x40049409 if sys.platform.startswith('linux') else None
+except ImportError:
+    _FICLONE = None
+
+# Errors meaning the filesystem (or the src/dst pair) can't reflink at all
+_NO_REFLINK_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+_reflink_supported = _FICLONE is not None
+
+
+def _fast_copy(src, dst):
+    """Copy a file with its metadata, cloning it (reflink) where the filesystem supports it.
+    
+    Falls back to shutil.copy2, and stops trying to clone after the first "not supported" error.
+    """
+    global _reflink_supported
+    if _reflink_supported:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError as e:
+            if e.errno in _NO_REFLINK_ERRNOS:
+                _reflink_supported = False
+    return shutil.copy2(src, dst)
+
+
+def _copy_if_changed(src, dst) -> bool:
+    """Copy src to dst unless dst already has the same size and mtime; returns whether it copied.
+    
+    Copies keep the source mtime (copystat), so files synced by an earlier run are skipped.
+    """
+    src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        if (dst_stat.st_mtime_ns, dst_stat.st_size) == (src_stat.st_mtime_ns, src_stat.st_size):
+            return False
+    _fast_copy(src, dst)
+    return True
 
 
 class SyncManager:
     """Manages syncing from workspace output to Hugo site."""
     
-    def __init__(self, source_root: Path, dest_root: Path, doc_dirs: List[str], dry_run: bool = False):
+    def __init__(self, source_root: Path, dest_root: Path, doc_dirs: List[str], dry_run: bool = False,
+                 max_workers: int = 8):
         self.source_root = source_root
         self.dest_root = dest_root
         self.doc_dirs = doc_dirs
         self.dry_run = dry_run
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self._stat_cache = {}
         self.stats = {
             'replaced_dirs': 0,
             'merged_dirs': 0,
             'copied_files': 0,
+            'unchanged_files': 0,
             'deleted_dirs': 0,
             'errors': 0
         }
@@ -37,6 +100,45 @@ class SyncManager:
         prefix = '[DRY RUN] ' if self.dry_run else ''
         print(f"{prefix}[{level}] {message}")
     
+    def _add_stat(self, key: str, count: int = 1):
+        """Increment a stats counter (directories are synced from several threads)."""
+        with self._stats_lock:
+            self.stats[key] += count
+    
+    def _stat(self, path: Path) -> Optional[os.stat_result]:
+        """Return the (cached) stat result for path, or None if it does not exist."""
+        key = os.fspath(path)
+        try:
+            return self._stat_cache[key]
+        except KeyError:
+            pass
+        try:
+            result = os.stat(key)
+        except OSError:
+            result = None
+        self._stat_cache[key] = result
+        return result
+    
+    def _exists(self, path: Path) -> bool:
+        return self._stat(path) is not None
+    
+    def _is_dir(self, path: Path) -> bool:
+        result = self._stat(path)
+        return result is not None and stat.S_ISDIR(result.st_mode)
+    
+    def _invalidate(self, path: Path):
+        """Forget the cached stat for a path we are about to create or delete."""
+        self._stat_cache.pop(os.fspath(path), None)
+    
+    def _run_parallel(self, func, jobs: List[tuple]):
+        """Run func(*job) for each job on a thread pool; the directory trees are independent."""
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs)))) as executor:
+            futures = [executor.submit(func, *job) for job in jobs]
+            for future in futures:
+                future.result()
+    
     def replace_directory(self, src: Path, dst: Path, description: str = ""):
         """
         Replace strategy: Delete destination directory and copy entire source directory.
@@ -48,26 +150,27 @@ class SyncManager:
         """
         desc = f" ({description})" if description else ""
         
-        if not src.exists():
+        if not self._exists(src):
             self.log(f"Source directory does not exist, skipping{desc}: {src}", "WARNING")
             return
         
-        if not src.is_dir():
+        if not self._is_dir(src):
             self.log(f"Source is not a directory, skipping{desc}: {src}", "WARNING")
             return
         
         self.log(f"Replacing{desc}: {dst}", "INFO")
         
         # Delete destination if it exists
-        if dst.exists():
+        if self._exists(dst):
             if not self.dry_run:
                 try:
+                    self._invalidate(dst)
                     shutil.rmtree(dst)
-                    self.stats['deleted_dirs'] += 1
+                    self._add_stat('deleted_dirs')
                     self.log(f"  Deleted: {dst}", "DEBUG")
                 except Exception as e:
                     self.log(f"  Error deleting {dst}: {e}", "ERROR")
-                    self.stats['errors'] += 1
+                    self._add_stat('errors')
                     return
             else:
                 self.log(f"  Would delete: {dst}", "DEBUG")
@@ -75,12 +178,13 @@ class SyncManager:
         # Copy source to destination
         if not self.dry_run:
             try:
-                shutil.copytree(src, dst)
-                self.stats['replaced_dirs'] += 1
+                self._invalidate(dst)
+                shutil.copytree(src, dst, copy_function=_fast_copy)
+                self._add_stat('replaced_dirs')
                 self.log(f"  Copied: {src} -> {dst}", "DEBUG")
             except Exception as e:
                 self.log(f"  Error copying {src} to {dst}: {e}", "ERROR")
-                self.stats['errors'] += 1
+                self._add_stat('errors')
         else:
             self.log(f"  Would copy: {src} -> {dst}", "DEBUG")
     
@@ -95,46 +199,60 @@ class SyncManager:
         """
         desc = f" ({description})" if description else ""
         
-        if not src.exists():
+        if not self._exists(src):
             self.log(f"Source directory does not exist, skipping{desc}: {src}", "WARNING")
             return
         
-        if not src.is_dir():
+        if not self._is_dir(src):
             self.log(f"Source is not a directory, skipping{desc}: {src}", "WARNING")
             return
         
         self.log(f"Merging{desc}: {src} -> {dst}", "INFO")
         
         # Create destination if it doesn't exist
-        if not dst.exists():
+        if not self._exists(dst):
             if not self.dry_run:
+                self._invalidate(dst)
                 dst.mkdir(parents=True, exist_ok=True)
         
-        # Walk through source and copy files
-        files_copied = 0
-        for src_path in src.rglob('*'):
-            if src_path.is_file():
-                # Calculate relative path and destination path
-                rel_path = src_path.relative_to(src)
-                dst_path = dst / rel_path
-                
-                # Create parent directories if needed
-                if not self.dry_run:
-                    dst_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file
-                if not self.dry_run:
+        # Walk through source and collect the files to copy; os.walk gets the entry
+        # types from scandir, so no extra stat per file is needed
+        copies = []
+        parents = set()
+        for dirpath, _, filenames in os.walk(src):
+            if not filenames:
+                continue
+            rel_dir = os.path.relpath(dirpath, src)
+            dst_dir = os.fspath(dst) if rel_dir == os.curdir else os.path.join(dst, rel_dir)
+            parents.add(dst_dir)
+            for name in filenames:
+                copies.append((os.path.join(dirpath, name), os.path.join(dst_dir, name)))
+        
+        if self.dry_run:
+            files_copied = len(copies)
+        else:
+            # Create parent directories once, then copy the files in parallel
+            for parent in parents:
+                os.makedirs(parent, exist_ok=True)
+            files_copied = 0
+            files_unchanged = 0
+            with ThreadPoolExecutor(max_workers=FILE_COPY_WORKERS) as executor:
+                futures = {executor.submit(_copy_if_changed, src_path, dst_path): (src_path, dst_path)
+                           for src_path, dst_path in copies}
+                for future in as_completed(futures):
                     try:
-                        shutil.copy2(src_path, dst_path)
-                        files_copied += 1
+                        if future.result():
+                            files_copied += 1
+                        else:
+                            files_unchanged += 1
                     except Exception as e:
+                        src_path, dst_path = futures[future]
                         self.log(f"  Error copying {src_path} to {dst_path}: {e}", "ERROR")
-                        self.stats['errors'] += 1
-                else:
-                    files_copied += 1
+                        self._add_stat('errors')
+            self._add_stat('unchanged_files', files_unchanged)
         
-        self.stats['merged_dirs'] += 1
-        self.stats['copied_files'] += files_copied
+        self._add_stat('merged_dirs')
+        self._add_stat('copied_files', files_copied)
         self.log(f"  Merged {files_copied} files", "DEBUG")
     
     def sync_doc_versions(self):
@@ -143,10 +261,12 @@ class SyncManager:
         self.log("Syncing doc version directories (REPLACE strategy)")
         self.log("=" * 80)
         
+        jobs = []
         for doc_dir in self.doc_dirs:
             src = self.source_root / 'content' / 'en' / doc_dir
             dst = self.dest_root / 'content' / 'en' / doc_dir
-            self.replace_directory(src, dst, f"doc version {doc_dir}")
+            jobs.append((src, dst, f"doc version {doc_dir}"))
+        self._run_parallel(self.replace_directory, jobs)
     
     def sync_blog_and_community(self):
         """Sync blog and community directories using merge strategy."""
@@ -154,10 +274,12 @@ class SyncManager:
         self.log("Syncing blog and community directories (MERGE strategy)")
         self.log("=" * 80)
         
+        jobs = []
         for subdir in ['blog', 'community']:
             src = self.source_root / 'content' / 'en' / subdir
             dst = self.dest_root / 'content' / 'en' / subdir
-            self.merge_directory(src, dst, subdir)
+            jobs.append((src, dst, subdir))
+        self._run_parallel(self.merge_directory, jobs)
     
     def sync_data(self):
         """Sync data directory using merge strategy."""
@@ -191,12 +313,12 @@ class SyncManager:
         self.log("=" * 80)
         
         # Verify source exists
-        if not self.source_root.exists():
+        if not self._exists(self.source_root):
             self.log(f"Source directory does not exist: {self.source_root}", "ERROR")
             sys.exit(1)
         
         # Verify destination exists
-        if not self.dest_root.exists():
+        if not self._exists(self.dest_root):
             self.log(f"Destination directory does not exist: {self.dest_root}", "ERROR")
             sys.exit(1)
         
@@ -212,6 +334,7 @@ class SyncManager:
         self.log(f"  Replaced directories: {self.stats['replaced_dirs']}")
         self.log(f"  Merged directories: {self.stats['merged_dirs']}")
         self.log(f"  Copied files: {self.stats['copied_files']}")
+        self.log(f"  Unchanged files (skipped): {self.stats['unchanged_files']}")
         self.log(f"  Deleted directories: {self.stats['deleted_dirs']}")
         self.log(f"  Errors: {self.stats['errors']}")
         self.log("=" * 80)
@@ -220,14 +343,42 @@ class SyncManager:
             sys.exit(1)
 
 
-def load_doc_dirs(config_path: Path) -> List[str]:
+def _load_config(config_path: Path, use_cache: bool = True) -> dict:
+    """Parse process.yaml, reusing the pickled result of a previous run if the file is unchanged."""
+    st = config_path.stat()
+    key = (str(config_path), st.st_mtime_ns, st.st_size)
+    if use_cache:
+        try:
+            with open(CONFIG_CACHE_FILE, 'rb') as f:
+                cached_key, cached_config = pickle.load(f)
+            if cached_key == key:
+                return cached_config
+        except Exception:
+            pass
+    
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    
+    if use_cache:
+        # Write atomically so a concurrent run never reads a partial cache file
+        try:
+            CONFIG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CONFIG_CACHE_FILE.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, CONFIG_CACHE_FILE)
+        except OSError as e:
+            print(f"Warning: could not write config cache {CONFIG_CACHE_FILE}: {e}", file=sys.stderr)
+    return config
+
+
+def load_doc_dirs(config_path: Path, use_cache: bool = True) -> List[str]:
     """Load doc_dirs from process.yaml configuration."""
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            doc_dirs = config.get('doc_dirs', [])
-            print(f"Loaded {len(doc_dirs)} doc directories from configuration")
-            return doc_dirs
+        config = _load_config(config_path, use_cache)
+        doc_dirs = config.get('doc_dirs', [])
+        print(f"Loaded {len(doc_dirs)} doc directories from configuration")
+        return doc_dirs
     except Exception as e:
         print(f"Error loading configuration from {config_path}: {e}", file=sys.stderr)
         sys.exit(1)
@@ -290,6 +441,19 @@ Examples:
         help='Perform a dry run without making any changes'
     )
     
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=8,
+        help='Number of directories synced in parallel (default: 8)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Always re-parse process.yaml instead of using the cached copy in {CONFIG_CACHE_FILE.parent}'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -317,14 +481,15 @@ Examples:
     dest_root = Path(args.dest).resolve()
     
     # Load doc_dirs from configuration
-    doc_dirs = load_doc_dirs(config_path)
+    doc_dirs = load_doc_dirs(config_path, use_cache=not args.no_cache)
     
     # Create sync manager and run
     sync_manager = SyncManager(
         source_root=source_root,
         dest_root=dest_root,
         doc_dirs=doc_dirs,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        max_workers=args.max_workers
     )
     
     sync_manager.run()
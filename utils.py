@@ -2,61 +2,200 @@ import os
 import re
 import json
 import difflib
+import functools
 import logging
-import subprocess
+import mmap
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 import yaml
 import html2text
+from pybars import Compiler
+
+try:
+    # Optional: C++ prefilter for HandleBarsContextBuilder's fuzzy match; difflib alone without it
+    from rapidfuzz import process as fuzz_process
+    from rapidfuzz.distance import Indel
+except ImportError:
+    fuzz_process = Indel = None
+
+try:
+    # Optional: native JSON parser for templateData.js contexts. Its JSONDecodeError subclasses
+    # json.JSONDecodeError, so the same except clause covers both
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+#
+# Precompiled Patterns
+#
+
+_SSI_RE = re.compile(r'<!--#include virtual="([^"]+\.html)" -->')
+_HB_SCRIPT_RE = re.compile(r'<script[^>]*type="text/x-handlebars-template"[^>]*>(.*?)</script>', re.DOTALL)
+_FRONT_MATTER_RE = re.compile(r'^---\n.*?\n---\n*', re.DOTALL | re.MULTILINE)
+_HEADING_RE = re.compile(r'^(#{1,6})\s*(.*)', re.MULTILINE)
+_HEADING_LINE_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+_BLANK_HEADING_RE = re.compile(r'^#{1,6}\s*$', re.MULTILINE)
+# First "# " or "## " heading line, for remove_duplicate_title_heading
+_TITLE_HEADING_RE = re.compile(r'^(#{1,2}) (.*)', re.MULTILINE)
+# Run of whitespace-only lines, starting at the newline that ends the previous line
+_BLANK_LINES_RE = re.compile(r'(?:\n[^\S\n]*(?=\n|\Z))*')
+# Every line that starts with '#', without its newline
+_HASH_LINE_RE = re.compile(r'^#.*', re.MULTILINE)
+_HB_KEY_RE = re.compile(r'\{\{([a-zA-Z0-9_]+)\}\}')
+_SANITIZE_RE = re.compile(r'(?<=[^\\\n])\\([wclks])')
+# List items that wrap a heading, e.g. "1. #### Heading" (see fix_malformed_headings)
+_MALFORMED_HEADING_RE = re.compile(r'^[ \t]*\d+\.[ \t]+(#{1,6}\s+.*)$', re.MULTILINE)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+# Bytes pattern: templateData.js is searched through an mmap rather than a decoded string
+_CONTEXT_RE = re.compile(rb'var\s+context\s*=\s*({.*?});', re.DOTALL)
+# sanitize_filename
+# Characters sanitize_filename drops outright
+_FILENAME_DELETE_TABLE = str.maketrans('', '', ':?*|<>"\'')
+# A run of slashes, or a run of whitespace/punctuation, becomes one hyphen; the two kinds of run
+# are matched separately so "a/ b" still becomes "a--b"
+_FILENAME_HYPHEN_RE = re.compile(r'[/\\]+|[\s\._,;]+')
+# Lines that start with "# of" in metric tables (see convert_html_to_md)
+_METRIC_H1_RE = re.compile(r'(?m)^# of')
+# YouTube embeds (see convert_youtube_embeds_to_shortcode)
+_YT_MARKER_RE = re.compile(r'loadVideo|youtube\.com/embed', re.IGNORECASE)
+# iframe.src="https://www.youtube.com/embed/VIDEO_ID?params"
+_YT_JS_RE = re.compile(r'iframe\.src\s*=\s*["\']https://www\.youtube\.com/embed/([a-zA-Z0-9_-]+)(\?[^"\']*)?["\']', re.IGNORECASE)
+# onclick="loadVideo('placeholder-id', 'VIDEO_ID?params', 'class')"
+_YT_ONCLICK_RE = re.compile(r'onclick\s*=\s*["\']loadVideo\([^,]*,\s*[\'"]([a-zA-Z0-9_-]+)(\?[^\'"]*)?\s*[\'"]', re.IGNORECASE)
+_YT_ONCLICK_CLASS_RE = re.compile(
+    r'onclick\s*=\s*["\']loadVideo\([^,]*,\s*[\'"]([a-zA-Z0-9_-]+)(\?[^\'"]*)?[\'"],?\s*[\'"]([^\'"]*)[\'"]\)',
+    re.IGNORECASE
+)
+# <p class="video__item video_list_1">...<span class="video__text">Title</span>
+_YT_TITLE_RE = re.compile(
+    r'<p[^>]*class="[^"]*video__item[^"]*video_list_(\d+)[^"]*"[^>]*>.*?'
+    r'<span[^>]*class="video__text"[^>]*>([^<]+)</span>',
+    re.IGNORECASE | re.DOTALL
+)
+# From the start of the video grid to the end of the video list
+_YT_GRID_RE = re.compile(
+    r'<div[^>]*class="[^"]*video__series__grid[^"]*"[^>]*>.*?</div>\s*</div>\s*</div>',
+    re.IGNORECASE | re.DOTALL
+)
+# <img id="..." onclick="loadVideo()">, with an optional "(YouTube)" caption
+_YT_SIMPLE_ONCLICK_RE = re.compile(
+    r'<img[^>]*id\s*=\s*["\']([^"\']+)["\'][^>]*onclick\s*=\s*["\']loadVideo\(\)["\'][^>]*>\s*'
+    r'(?:<span[^>]*>\([^)]*YouTube[^)]*\)</span>\s*)?',
+    re.IGNORECASE | re.DOTALL
+)
+_YT_NOTIFICATION_RE = re.compile(
+    r'<span[^>]*id\s*=\s*["\']notification["\'][^>]*>.*?YouTube.*?</span>',
+    re.IGNORECASE | re.DOTALL
+)
 
 def execute_step(step, *args):
     try:
         return step(*args)
     except Exception as e:
-        logging.error(f'Error executing step {step.__name__}: {e}')
-        raise e
+        logging.error('Error executing step %s: %s', step.__name__, e, exc_info=True)
+        raise
 
 class HandleBarsContextBuilder:
     TemplateJS_File = 'templateData.js'
     def _extract_context_from_js(self, file_path):
-        context_pattern = re.compile(r'var\s+context\s*=\s*({.*?});', re.DOTALL)
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            match = context_pattern.search(content)
-            if match:
-                context_str = match.group(1)
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # mmap can't map an empty file
+                return None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                match = _CONTEXT_RE.search(content)
+                # Copy the group out while the map is still open
+                context_str = match.group(1) if match else None
+            if context_str is not None:
                 try:
-                    context_dict = json.loads(context_str)
+                    context_dict = json_loads(context_str)
                     return context_dict
                 except json.JSONDecodeError as e:
-                    print(f"Error decoding JSON in file {file_path}: {e}")
+                    logging.error('Error decoding JSON in file %s: %s', file_path, e)
                     return None
         return None
     
+    def _iter_template_files(self, root_dir):
+        """Yield templateData.js paths under root_dir, in the same order as os.walk"""
+        stack = [root_dir]
+        while stack:
+            dirpath = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        # DirEntry caches the type from the directory listing, so no extra stat here
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name == self.TemplateJS_File and not entry.is_dir():
+                            logging.debug("Found %s file: %s", self.TemplateJS_File, entry.path)
+                            yield entry.path
+            except OSError:
+                # Unreadable directories are skipped, as os.walk does
+                continue
+            # Reversed so subdirectories are popped, and so visited, in listing order
+            stack.extend(reversed(subdirs))
+    
     def _find_templatedata_js_files(self, root_dir):
-        logging.debug(f"Searching for {self.TemplateJS_File} files in {root_dir}")
+        logging.debug("Searching for %s files in %s", self.TemplateJS_File, root_dir)
+        paths = list(self._iter_template_files(root_dir))
+        
+        # Read and parse the files concurrently; map keeps the discovery order
         context_data = {}
-        for dirpath, _, filenames in os.walk(root_dir):
-            for filename in filenames:
-                if filename == self.TemplateJS_File:
-                    file_path = os.path.join(dirpath, filename)
-                    logging.debug(f"Found {self.TemplateJS_File} file: {file_path}")
-                    context_dict = self._extract_context_from_js(file_path)
-                    if context_dict:
-                        context_data[file_path] = context_dict
-        logging.debug(f"Found {len(context_data)} {self.TemplateJS_File} files")
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            for file_path, context_dict in zip(paths, executor.map(self._extract_context_from_js, paths)):
+                if context_dict:
+                    context_data[file_path] = context_dict
+        logging.debug("Found %d %s files", len(context_data), self.TemplateJS_File)
         return context_data
 
     def __init__(self, root_dir="."):
         self.context_data = self._find_templatedata_js_files(root_dir)
-        self.context_dict = {}
-        for file_path, context in self.context_data.items():
-            self.context_dict[file_path] = context
+        # Both names refer to the same mapping of templateData.js path -> context
+        self.context_dict = self.context_data
+        self._keys_list = list(self.context_dict)
+        # Directory each templateData.js belongs to (the one holding its js/ folder) -> context
+        self._owner_index = {}
+        for file_path, context in self.context_dict.items():
+            self._owner_index.setdefault(self._owner_dir(file_path), context)
+        # Resolved lookups, keyed on the requested path; the fuzzy match only runs once per path
+        self._context_cache = {}
     
     def __repr__(self):
         return str(self.context_dict)
         
     def get_context(self, file_path):
-        close_matches = difflib.get_close_matches(file_path, self.context_dict.keys(), n=1, cutoff=0.4)
+        try:
+            return self._context_cache[file_path]
+        except KeyError:
+            context = self._context_cache[file_path] = self._match_context(file_path)
+            return context
+    
+    @staticmethod
+    def _owner_dir(template_path):
+        js_dir = os.path.dirname(os.path.abspath(template_path))
+        return os.path.dirname(js_dir) if os.path.basename(js_dir) == 'js' else js_dir
+    
+    def _match_context(self, file_path):
+        # A file belongs to the nearest enclosing directory that owns a templateData.js; only
+        # files outside every such directory need the fuzzy match
+        directory = os.path.dirname(os.path.abspath(file_path))
+        while True:
+            context = self._owner_index.get(directory)
+            if context is not None:
+                return context
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        candidates = self._keys_list
+        if fuzz_process is not None:
+            # Indel similarity is 2*LCS/len and never below difflib's ratio, so this only drops
+            # keys difflib would reject too; difflib still scores and breaks ties on the rest
+            candidates = [match[0] for match in fuzz_process.extract(
+                file_path, candidates, scorer=Indel.normalized_similarity,
+                score_cutoff=0.4 - 1e-9, limit=None)]
+        close_matches = difflib.get_close_matches(file_path, candidates, n=1, cutoff=0.4)
         if close_matches:
             return self.context_dict.get(close_matches[0], {})
         return {}
@@ -65,6 +204,29 @@ class HandleBarsContextBuilder:
 # Markdown Processing Functions
 #
 
+def _strip_numeric_prefix(text):
+    """Remove a leading section number (1., 1:, 1.2., 1.2.3:, ...) and the whitespace after it.
+
+    Matches what re.sub(r'^\\d+(\\.\\d+)*[.:]*\\s*', '', text) does to a single line, without
+    the regex engine; most headings don't start with a digit and return on the first check.
+    """
+    n = len(text)
+    if not n or not text[0].isdecimal():
+        return text
+    i = 1
+    while i < n and text[i].isdecimal():
+        i += 1
+    # Further ".<digits>" groups
+    while i + 1 < n and text[i] == '.' and text[i + 1].isdecimal():
+        i += 2
+        while i < n and text[i].isdecimal():
+            i += 1
+    while i < n and text[i] in '.:':
+        i += 1
+    while i < n and text[i].isspace():
+        i += 1
+    return text[i:]
+
 def process_markdown_headings(content, context):
     """
     Process markdown headings with optional transformations.
@@ -79,16 +241,19 @@ def process_markdown_headings(content, context):
     Returns:
         Tuple of (processed_content, context)
     """
+    up_level = context.get('up_level', False)
+    remove_numeric = context.get('remove_numeric', False)
+    
     # if content is not string, convert it to string
     if not isinstance(content, str):
         markdown_content = '\n'.join(content)
     else:
         markdown_content = content
-
-    up_level = context.get('up_level', False)
-    remove_numeric = context.get('remove_numeric', False)
     
-    logging.debug(f'Processing markdown headings: up_level={up_level}, remove_numeric={remove_numeric}')
+    if not up_level and not remove_numeric:
+        return markdown_content, context
+    
+    logging.debug('Processing markdown headings: up_level=%s, remove_numeric=%s', up_level, remove_numeric)
     
     def bump_heading_level(match):
         level = len(match.group(1))
@@ -98,58 +263,67 @@ def process_markdown_headings(content, context):
     def remove_numeric_heading(match):
         heading_text = match.group(2)
         # Remove numeric headings of the form: 1., 1:, 1.2., 1.2:, 1.2.3., 1.2.3:, etc.
-        heading_text = re.sub(r'^\d+(\.\d+)*[.:]*\s*', '', heading_text)
+        heading_text = _strip_numeric_prefix(heading_text)
         return '#' * len(match.group(1)) + ' ' + heading_text
 
-    # Find all headings
-    heading_pattern = re.compile(r'^(#{1,6})\s*(.*)', re.MULTILINE)
     processed_content = markdown_content
+    numeric_removed = False
     
     if up_level:
-        lines = markdown_content.split('\n')
-        processed_lines = []
         in_migration_section = False
+        # Remove numeric prefixes while upleveling, instead of a second pass over the whole
+        # content. A heading without text on its line makes the regex pass continue onto the
+        # following lines, so keep the separate pass for that (rare) case.
+        fuse_numeric = remove_numeric and not _BLANK_HEADING_RE.search(markdown_content)
         
-        for line in lines:
-            heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-            if heading_match:
-                heading_text = heading_match.group(2).strip()
-                heading_level = len(heading_match.group(1))
-                
-                # Check if we're entering the migration section
-                if heading_text == "ZooKeeper to KRaft Migration":
-                    in_migration_section = True
-                    # Set this heading to h3 level
-                    processed_lines.append('### ' + heading_text)
-                    continue
-                
-                # Check if we're exiting the migration section
-                # Exit when we encounter Tiered Storage (regardless of heading level or numeric prefix)
-                # or when we encounter a true h2 heading (not Tiered Storage)
-                if in_migration_section and ("Tiered Storage" in heading_text or (heading_level == 2 and "Tiered Storage" not in heading_text)):
-                    in_migration_section = False
-                    # Apply normal upleveling for the heading that caused us to exit
-                    processed_lines.append(bump_heading_level(heading_match))
-                    continue
-                
-                # If we're in the migration section, don't uplevel subsections - keep them at h4
-                if in_migration_section:
-                    # Keep subsections at h4 level (don't uplevel them)
-                    if heading_level >= 2:  # If it's h2 or higher, set it to h4
-                        processed_lines.append('#### ' + heading_text)
-                    else:
-                        processed_lines.append(line)  # Keep original level if it's already h3 or lower
-                else:
-                    # Apply normal upleveling for headings outside the migration section
-                    processed_lines.append(bump_heading_level(heading_match))
-            else:
-                processed_lines.append(line)
+        def finish_line(line):
+            if fuse_numeric and line.startswith('#'):
+                hashes = min(len(line) - len(line.lstrip('#')), 6)
+                line = line[:hashes] + ' ' + _strip_numeric_prefix(line[hashes:].lstrip())
+            return line
         
-        processed_content = '\n'.join(processed_lines)
+        # Only lines starting with '#' can change, so the other lines are never visited; the
+        # callbacks run in document order, which keeps the migration-section state correct
+        def process_line(line_match):
+            nonlocal in_migration_section
+            line = line_match.group(0)
+            heading_match = _HEADING_LINE_RE.match(line)
+            if not heading_match:
+                return finish_line(line)
+            
+            heading_text = heading_match.group(2).strip()
+            heading_level = len(heading_match.group(1))
+            
+            # Check if we're entering the migration section
+            if heading_text == "ZooKeeper to KRaft Migration":
+                in_migration_section = True
+                # Set this heading to h3 level
+                return finish_line('### ' + heading_text)
+            
+            # Check if we're exiting the migration section
+            # Exit when we encounter Tiered Storage (regardless of heading level or numeric prefix)
+            # or when we encounter a true h2 heading (not Tiered Storage)
+            if in_migration_section and ("Tiered Storage" in heading_text or (heading_level == 2 and "Tiered Storage" not in heading_text)):
+                in_migration_section = False
+                # Apply normal upleveling for the heading that caused us to exit
+                return finish_line(bump_heading_level(heading_match))
+            
+            # If we're in the migration section, don't uplevel subsections - keep them at h4
+            if in_migration_section:
+                # Keep subsections at h4 level (don't uplevel them)
+                if heading_level >= 2:  # If it's h2 or higher, set it to h4
+                    return finish_line('#### ' + heading_text)
+                return finish_line(line)  # Keep original level if it's already h3 or lower
+            
+            # Apply normal upleveling for headings outside the migration section
+            return finish_line(bump_heading_level(heading_match))
+        
+        processed_content = _HASH_LINE_RE.sub(process_line, markdown_content)
+        numeric_removed = fuse_numeric
 
-    if remove_numeric:
+    if remove_numeric and not numeric_removed:
         # Remove numeric headings
-        processed_content = heading_pattern.sub(remove_numeric_heading, processed_content)
+        processed_content = _HEADING_RE.sub(remove_numeric_heading, processed_content)
 
     return processed_content, context
 
@@ -172,27 +346,66 @@ def fix_malformed_headings(content, context):
     if not isinstance(content, str):
         return content, context
         
-    # Regex to find list items that contain headings
     # Matches: optional whitespace (horizontal only), number + dot, optional whitespace, heading marks, space, text
     # Capture group 1: The heading part (#### Heading)
     # Note: We use [ \t] instead of \s to avoid matching newlines
-    pattern = re.compile(r'^[ \t]*\d+\.[ \t]+(#{1,6}\s+.*)$', re.MULTILINE)
-    
-    processed_content = pattern.sub(r'\1', content)
+    processed_content, count = _MALFORMED_HEADING_RE.subn(r'\1', content)
     
-    if processed_content != content:
+    if count:
         logging.debug("Fixed malformed headings in content")
         
     return processed_content, context
 
 def _get_front_matter(context, values):
     template = context['front_matter']["template"]
-    return template.format(**values)
+    # format_map reads the values dict directly instead of unpacking it into kwargs
+    return template.format_map(values)
+
+def _strip_front_matter(content):
+    """
+    Remove front matter blocks, same as _FRONT_MATTER_RE.sub('', content).
+    
+    The common case of a single block at the top of the document is handled with plain
+    string searches; anything else falls back to the regex.
+    """
+    if content.startswith('---\n'):
+        end = content.find('\n---', 4)
+        if end == -1:
+            # Without a closing delimiter no block can match anywhere
+            return content
+        rest = content[end + 4:].lstrip('\n')
+        if not rest.startswith('---') and '\n---' not in rest:
+            return rest
+    return _FRONT_MATTER_RE.sub('', content)
+
+def _strip_comments(content):
+    """
+    Remove HTML comments and the newlines that follow them, same as a DOTALL
+    re.sub(r'<!--.*?-->\\n*', '', content), using str.find to jump between delimiters.
+    """
+    start = content.find('<!--')
+    if start == -1:
+        return content
+    parts = []
+    pos = 0
+    while start != -1:
+        end = content.find('-->', start + 4)
+        if end == -1:
+            # An unterminated comment can't match, and neither can any after it
+            break
+        parts.append(content[pos:start])
+        pos = end + 3
+        while pos < len(content) and content[pos] == '\n':
+            pos += 1
+        start = content.find('<!--', pos)
+    parts.append(content[pos:])
+    return ''.join(parts)
 
 def update_front_matter(content, context):
     # Remove existing comment and front matter if they exist
-    content = re.sub(r'<!--.*?-->\n*', '', content, flags=re.DOTALL)
-    content = re.sub(r'^---\n.*?\n---\n*', '', content, flags=re.DOTALL | re.MULTILINE)
+    content = _strip_comments(content)
+    if '---' in content:
+        content = _strip_front_matter(content)
     front_matter = _get_front_matter(context, context["template_values"])
     
     return f"{front_matter}\n{content}", context
@@ -205,11 +418,9 @@ def sanitize_filename(text):
     # Remove or replace special characters
     text = text.strip()
     # Remove colons, question marks, quotes, asterisks, pipe, less/greater than
-    text = re.sub(r'[:\?\*\|<>\"\']+', '', text)
-    # Replace slashes and backslashes with hyphens
-    text = re.sub(r'[/\\]+', '-', text)
-    # Replace multiple spaces or special chars with single hyphen
-    text = re.sub(r'[\s\._,;]+', '-', text)
+    text = text.translate(_FILENAME_DELETE_TABLE)
+    # Replace slashes and backslashes, and multiple spaces or special chars, with a single hyphen
+    text = _FILENAME_HYPHEN_RE.sub('-', text)
     # Remove leading/trailing hyphens
     text = text.strip('-')
     # Convert to lowercase
@@ -225,19 +436,24 @@ def sanitize_yaml_title(text):
     Removes trailing colons and other problematic characters.
     """
     text = text.strip()
-    # Remove trailing punctuation (colons, commas, semicolons) in any combination
-    text = re.sub(r'[:;,\s]+$', '', text)
-    # Strip again after removing trailing chars
-    text = text.strip()
-    return text
+    # Remove trailing punctuation (colons, commas, semicolons) and whitespace in any combination
+    while True:
+        trimmed = text.rstrip(':;,').rstrip()
+        if trimmed == text:
+            return text
+        text = trimmed
+
+@functools.lru_cache(maxsize=8)
+def _split_heading_re(heading_level):
+    return re.compile(rf'^({"#" * heading_level} )(.+)$', re.MULTILINE)
 
 def split_markdown_by_heading(content, context):
     heading_level = context["section"]["strategy_params"][0]
-    heading_pattern = re.compile(rf'^({"#" * heading_level} )(.+)$') 
-    lines = content.split('\n')
-    out = []
-    current_title = None
+    heading_pattern = _split_heading_re(heading_level)
     counter = 1
+    # Front matter inputs that are the same for every section
+    tags = context["front_matter"]["tags"]
+    section_type = context["section"].get("type", "docs")
     
     def write_to_file(title, content):
         # Sanitize title for YAML front matter
@@ -251,33 +467,29 @@ def split_markdown_by_heading(content, context):
         template_values = {
             "title": sanitized_title,
             "description": sanitized_title,
-            "tags": context["front_matter"]["tags"], 
+            "tags": tags, 
             "aliases": "",
             "weight": counter,
-            "type": context["section"].get("type", "docs"),
+            "type": section_type,
             "keywords": ""
         }
         context["template_values"] = template_values
         out, _ = update_front_matter(out, context)
         # Remove duplicate H1 if it matches the title
         out, _ = remove_duplicate_title_heading(out, context)
-        with open(output_file_name, 'w') as file:
-            file.writelines(out)
-
-    for line in lines:
-        match = heading_pattern.match(line)
-        if match:
-            heading_text = match.group(2).strip()
-            if current_title:
-                write_to_file(current_title, out)
-                counter += 1
-            current_title = heading_text
-            out = [line]
-        else:
-            out.append(line)
-    
-    if current_title:
-        write_to_file(current_title, out) 
+        with open(output_file_name, 'wb') as file:
+            file.write(out.encode('utf-8'))
+
+    # Each section runs from its heading up to (not including) the newline before the next
+    # heading; anything before the first heading is dropped, as are sections with a blank title
+    matches = list(heading_pattern.finditer(content))
+    for i, match in enumerate(matches):
+        title = match.group(2).strip()
+        if not title:
+            continue
+        end = matches[i + 1].start() - 1 if i + 1 < len(matches) else len(content)
+        write_to_file(title, content[match.start():end])
+        counter += 1
     
     return "", context
 
@@ -306,67 +518,107 @@ def remove_duplicate_title_heading(content, context):
         return content, context
     
     # Find the first H1 or H2 heading
-    lines = content.split('\n')
-    first_heading_index = None
-    first_heading_text = None
-    heading_level = None
-    
-    for i, line in enumerate(lines):
-        # Check for H1 (single #)
-        if line.startswith('# ') and not line.startswith('## '):
-            first_heading_text = line[2:].strip()  # Remove '# ' prefix
-            first_heading_index = i
-            heading_level = 1
-            break
-        # Check for H2 (double ##)
-        elif line.startswith('## ') and not line.startswith('### '):
-            first_heading_text = line[3:].strip()  # Remove '## ' prefix
-            first_heading_index = i
-            heading_level = 2
-            break
+    match = _TITLE_HEADING_RE.search(content)
     
     # If we found a heading and it matches the title, remove it
-    if first_heading_index is not None and first_heading_text == title:
-        logging.info(f'Removing duplicate H{heading_level} heading: "{title}"')
+    if match and match.group(2).strip() == title:
+        heading_level = len(match.group(1))
+        logging.info('Removing duplicate H%d heading: "%s"', heading_level, title)
         # Remove the heading line and any immediately following empty lines
-        del lines[first_heading_index]
-        # Remove following empty lines (but keep first non-empty)
-        while first_heading_index < len(lines) and lines[first_heading_index].strip() == '':
-            del lines[first_heading_index]
-        content = '\n'.join(lines)
+        # (but keep first non-empty)
+        blank_end = _BLANK_LINES_RE.match(content, match.end()).end()
+        if blank_end < len(content):
+            content = content[:match.start()] + content[blank_end + 1:]
+        else:
+            # Nothing but blank lines follows, so the newline ending the previous line goes too
+            content = content[:max(match.start() - 1, 0)]
     
     return content, context
 
+def _link_url_updater(search_string, value, action):
+    """Build the URL rewrite for one link_updates entry, or None for an action that changes nothing"""
+    if action == 'prefix':
+        def update_url(url):
+            if search_string in url and not url.startswith(value):
+                return value + url
+            return url
+    elif action == 'replace':
+        def update_url(url):
+            return value if search_string in url else url
+    elif action == 'substitute':
+        # Compiled once here rather than looked up in re's cache for every link
+        pattern = re.compile(search_string)
+        def update_url(url):
+            return pattern.sub(value, url)
+    else:
+        return None
+    return update_url
+
 def process_markdown_links(content, context):
     link_updates = context.get('link_updates', [])
     # logging.info(f'Processing markdown links: {link_updates}')
+    if not link_updates:
+        return content, context
+    updaters = []
     for update in link_updates:
         search_string = update.get('search_str', '')
         action = update.get('action', '')
-        value = update.get('value', '')
-        content = _update_links_in_markdown(content, search_string, value, action)
+        # Until a rule has been kept, every URL a rule sees is original document text, so a
+        # prefix or replace rule whose search string isn't in the document can never fire.
+        # (A substitute pattern can't be tested against the whole document: its anchors would
+        # apply to the document rather than to each URL.)
+        if not updaters and action in ('prefix', 'replace') and search_string not in content:
+            continue
+        updater = _link_url_updater(search_string, update.get('value', ''), action)
+        if updater is not None:
+            updaters.append(updater)
+    if not updaters:
+        return content, context
+    content, ok = _update_links_in_markdown(content, updaters)
+    if not ok:
+        # An update produced a URL that changes where the link pattern matches (empty, or
+        # containing ')'), so later updates must see the rewritten text: one pass per update
+        for updater in updaters:
+            content, _ = _update_links_in_markdown(content, [updater])
     return content, context
         
-def _update_links_in_markdown(content, search_string, value, action):
-    # Regex to find markdown links
-    link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+def _update_links_in_markdown(content, updaters):
+    """
+    Apply every URL updater (see _link_url_updater) to each link in one scan.
+    
+    Returns the new content and whether it matches what one pass per update would produce;
+    that holds as long as every intermediate URL still ends at the same ')'.
+    """
+    ok = True
+    changed = 0
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    
     def replace_link(match):
-        text, url = match.groups()
-        if action == 'prefix' and search_string in url and not url.startswith(value):
-            url = value + url
-        elif action == 'replace' and search_string in url:
-            url = value
-        elif action == 'substitute':
-            url = re.sub(search_string, value, url)
+        nonlocal ok, changed
+        text, original_url = match.groups()
+        url = original_url
+        for i, update_url in enumerate(updaters, 1):
+            url = update_url(url)
+            if i < len(updaters) and (not url or ')' in url):
+                ok = False
+                break
+        
+        if url == original_url:
+            # Nothing to rewrite; reuse the matched text instead of rebuilding it
+            return match.group(0)
         
-        logging.info(f'Updating links in markdown content: {action} {search_string} -> {value}') 
-        logging.info(f'[BEFORE] {match.group(0)}')
-        logging.info(f'[AFTER] [{text}]({url})')
+        changed += 1
+        if debug:
+            logging.debug('Updated link: %s -> [%s](%s)', match.group(0), text, url)
 
         return f'[{text}]({url})'
 
-    updated_content = link_pattern.sub(replace_link, content)
-    return updated_content
+    updated_content = _LINK_RE.sub(replace_link, content)
+    if not ok:
+        return content, False
+    if changed:
+        logging.info('Updated %d links in markdown content', changed)
+    return updated_content, True
 
 def get_title_from_filename(filename):
     return os.path.splitext(os.path.basename(filename))[0].replace('-', ' ').title()
@@ -374,51 +626,69 @@ def get_title_from_filename(filename):
 def write_file(dest_file, markdown_content, context):
     try:
         dest_file = dest_file.replace('.html', '.md')
-        with open(dest_file, 'w', encoding='utf-8') as md_file:
-            md_file.write(markdown_content)
-        logging.info(f'Converted and saved Markdown file: {dest_file}')
+        # Encoded up front and written in binary mode, skipping the text I/O layer
+        with open(dest_file, 'wb') as md_file:
+            front_matter = context.get('front_matter_block')
+            if front_matter:
+                md_file.write(front_matter.encode('utf-8'))
+                md_file.write(b'\n')
+            md_file.write(markdown_content.encode('utf-8'))
+        logging.info('Converted and saved Markdown file: %s', dest_file)
     except Exception as e:
-        logging.error(f'Error writing file {dest_file}: {e}')
+        logging.error('Error writing file %s: %s', dest_file, e)
         raise e
 
 
+# One compiler for the whole process; compiled templates are cached per source below
+_HB_COMPILER = Compiler()
+
+@functools.lru_cache(maxsize=256)
+def _compile_handlebars_template(source):
+    return _HB_COMPILER.compile(source)
+
 def render_handlebars_template(html_content, context):
-    logging.debug(f'Rendering Handlebars template with context: {context}')
-    from pybars import Compiler
-    compiler = Compiler()
-    template = compiler.compile(html_content)
+    logging.debug('Rendering Handlebars template with context: %s', context)
+    template = _compile_handlebars_template(html_content)
     return template(context)
 
 def process_ssi_tags(html_content, context):
+    if '<!--#include' not in html_content:
+        return html_content, context
+
     base_dir = context.get('base_dir', '.')
-    ssi_pattern = re.compile(r'<!--#include virtual="([^"]+\.html)" -->')
-    matches = ssi_pattern.findall(html_content)
-    for match in matches:
-        include_path = os.path.join(base_dir, match)
-        if os.path.exists(include_path):
-            with open(include_path, 'r', encoding='utf-8') as include_file:
-                include_content = include_file.read()
-            html_content = html_content.replace(f'<!--#include virtual="{match}" -->', include_content)
-            logging.debug(f'Processed SSI include: {match}')
-        else:
-            logging.warning(f'Include file not found: {include_path}')
+
+    def read_include(match):
+        include_path = os.path.join(base_dir, match.group(1))
+        if not os.path.exists(include_path):
+            logging.warning('Include file not found: %s', include_path)
+            return match.group(0)
+        with open(include_path, 'r', encoding='utf-8') as include_file:
+            include_content = include_file.read()
+        logging.debug('Processed SSI include: %s', match.group(1))
+        return include_content
+
+    html_content = _SSI_RE.sub(read_include, html_content)
     return html_content, context
 
 def process_ssi_tags_with_hugo(html_content, context):
-    ssi_pattern = re.compile(r'<!--#include virtual="([^"]+\.html)" -->')
-    matches = ssi_pattern.findall(html_content)
-    for match in matches:
-        if "generated" in match:
+    if '<!--#include' not in html_content:
+        return html_content, context
+
+    def to_shortcode(match):
+        include = match.group(1)
+        if "generated" in include:
             # {{< include-html file="static/39/generated/kafka_config.html" >}}
             hb_context = context.get('hb', {})
             version = hb_context.get('version', '{}')
             prefix = f"/static/{version}/"
-            md_file = f"{prefix}{match}"
+            md_file = f"{prefix}{include}"
         else:
-            md_file = match.replace('.html', '.md')
+            md_file = include.replace('.html', '.md')
         shortcode = f'{{{{< include-html file="{md_file}" >}}}}'
-        html_content = html_content.replace(f'<!--#include virtual="{match}" -->', shortcode)
-        logging.debug(f'Replaced SSI with Hugo shortcode: {shortcode}')
+        logging.debug('Replaced SSI with Hugo shortcode: %s', shortcode)
+        return shortcode
+
+    html_content = _SSI_RE.sub(to_shortcode, html_content)
     return html_content, context
 
 def convert_youtube_embeds_to_shortcode(html_content, context):
@@ -430,17 +700,20 @@ def convert_youtube_embeds_to_shortcode(html_content, context):
     2. onclick="loadVideo('id', 'VIDEO_ID?params', 'class')" inline
     3. Video series with titles in a separate navigation block
     """
+    # Every video ID comes from an embed URL or a loadVideo call; without either there is
+    # nothing to convert
+    if not _YT_MARKER_RE.search(html_content):
+        return html_content, context
+    
     logging.info('Converting YouTube embeds to Hugo shortcodes')
     
     # Pattern 1: Extract video IDs from JavaScript loadVideo functions
     # Matches: iframe.src="https://www.youtube.com/embed/VIDEO_ID?params"
-    js_pattern = re.compile(r'iframe\.src\s*=\s*["\']https://www\.youtube\.com/embed/([a-zA-Z0-9_-]+)(\?[^"\']*)?["\']', re.IGNORECASE)
-    js_matches = js_pattern.findall(html_content)
+    js_matches = _YT_JS_RE.findall(html_content)
     
     # Pattern 2: Extract video IDs from onclick attributes with parameters
     # Matches: onclick="loadVideo('placeholder-id', 'VIDEO_ID?params', 'class')"
-    onclick_pattern = re.compile(r'onclick\s*=\s*["\']loadVideo\([^,]*,\s*[\'"]([a-zA-Z0-9_-]+)(\?[^\'"]*)?\s*[\'"]', re.IGNORECASE)
-    onclick_matches = onclick_pattern.findall(html_content)
+    onclick_matches = _YT_ONCLICK_RE.findall(html_content)
     
     # Collect all video IDs and their class associations
     video_ids = []
@@ -451,18 +724,14 @@ def convert_youtube_embeds_to_shortcode(html_content, context):
     
     # Extract video IDs with their associated classes
     # Pattern: onclick="loadVideo('placeholder', 'VIDEO_ID?params', 'class')"
-    onclick_class_pattern = re.compile(
-        r'onclick\s*=\s*["\']loadVideo\([^,]*,\s*[\'"]([a-zA-Z0-9_-]+)(\?[^\'"]*)?[\'"],?\s*[\'"]([^\'"]*)[\'"]\)',
-        re.IGNORECASE
-    )
-    for match in onclick_class_pattern.finditer(html_content):
+    for match in _YT_ONCLICK_CLASS_RE.finditer(html_content):
         video_id = match.group(1)
         class_name = match.group(3)  # Changed from group(2) to group(3) because we added query param group
         video_ids.append(video_id)
         video_classes[class_name] = video_id
-        logging.debug(f'Found video ID {video_id} with class {class_name}')
+        logging.debug('Found video ID %s with class %s', video_id, class_name)
     
-    logging.info(f'Found {len(video_ids)} YouTube video(s): {video_ids}')
+    logging.info('Found %d YouTube video(s): %s', len(video_ids), video_ids)
     
     if not video_ids:
         return html_content, context
@@ -470,17 +739,11 @@ def convert_youtube_embeds_to_shortcode(html_content, context):
     # Pattern 3: Extract video titles from navigation list (if exists)
     # Matches: <p class="video__item video_list_1">...<span class="video__text">Title</span>...
     video_titles = {}  # Map video number to title
-    title_pattern = re.compile(
-        r'<p[^>]*class="[^"]*video__item[^"]*video_list_(\d+)[^"]*"[^>]*>.*?'
-        r'<span[^>]*class="video__text"[^>]*>([^<]+)</span>',
-        re.IGNORECASE | re.DOTALL
-    )
-    
-    for match in title_pattern.finditer(html_content):
+    for match in _YT_TITLE_RE.finditer(html_content):
         video_num = match.group(1)
         title = match.group(2).strip()
         video_titles[video_num] = title
-        logging.debug(f'Found video title #{video_num}: {title}')
+        logging.debug('Found video title #%s: %s', video_num, title)
     
     # Check if we have a video series with titles
     has_video_series = len(video_titles) > 0 and len(video_titles) == len(video_ids)
@@ -488,13 +751,7 @@ def convert_youtube_embeds_to_shortcode(html_content, context):
     if has_video_series:
         logging.info('Detected video series with navigation - creating structured output')
         
-        # Find and replace the entire video grid section
-        # Pattern matches from the start of video grid to the end of video list
-        grid_pattern = re.compile(
-            r'<div[^>]*class="[^"]*video__series__grid[^"]*"[^>]*>.*?</div>\s*</div>\s*</div>',
-            re.IGNORECASE | re.DOTALL
-        )
-        
+        # Find and replace the entire video grid section (see _YT_GRID_RE)
         # Build the replacement with titles and videos
         replacement_parts = []
         for i, (video_num, title) in enumerate(sorted(video_titles.items()), 1):
@@ -507,8 +764,8 @@ def convert_youtube_embeds_to_shortcode(html_content, context):
                 replacement_parts.append(f'<div class="youtube-video">\n{{{{< youtube "{video_id}" >}}}}\n</div>\n')
         
         replacement = '\n'.join(replacement_parts)
-        html_content = grid_pattern.sub(replacement, html_content)
-        logging.info(f'Replaced video series grid with {len(video_titles)} titled videos')
+        html_content = _YT_GRID_RE.sub(replacement, html_content)
+        logging.info('Replaced video series grid with %d titled videos', len(video_titles))
         
     else:
         # Original behavior: Replace individual img tags
@@ -523,39 +780,30 @@ def convert_youtube_embeds_to_shortcode(html_content, context):
             if img_onclick_pattern.search(html_content):
                 replacement = f'\n\n<div class="youtube-video">\n{{{{< youtube "{video_id}" >}}}}\n</div>\n\n'
                 html_content = img_onclick_pattern.sub(replacement, html_content, count=1)
-                logging.debug(f'Replaced YouTube embed with video ID: {video_id}')
+                logging.debug('Replaced YouTube embed with video ID: %s', video_id)
                 continue
         
         # Handle simple onclick="loadVideo()" without parameters
-        simple_onclick_pattern = re.compile(
-            r'<img[^>]*id\s*=\s*["\']([^"\']+)["\'][^>]*onclick\s*=\s*["\']loadVideo\(\)["\'][^>]*>\s*'
-            r'(?:<span[^>]*>\([^)]*YouTube[^)]*\)</span>\s*)?',
-            re.IGNORECASE | re.DOTALL
-        )
-        
-        simple_matches = simple_onclick_pattern.finditer(html_content)
+        simple_matches = _YT_SIMPLE_ONCLICK_RE.finditer(html_content)
         for i, match in enumerate(simple_matches):
             if i < len(video_ids):
                 video_id = video_ids[i]
                 replacement = f'\n\n<div class="youtube-video">\n{{{{< youtube "{video_id}" >}}}}\n</div>\n\n'
                 html_content = html_content.replace(match.group(0), replacement, 1)
-                logging.debug(f'Replaced simple YouTube embed with video ID: {video_id}')
+                logging.debug('Replaced simple YouTube embed with video ID: %s', video_id)
     
     # Clean up any remaining notification spans about YouTube
-    notification_pattern = re.compile(
-        r'<span[^>]*id\s*=\s*["\']notification["\'][^>]*>.*?YouTube.*?</span>',
-        re.IGNORECASE | re.DOTALL
-    )
-    html_content = notification_pattern.sub('', html_content)
+    html_content = _YT_NOTIFICATION_RE.sub('', html_content)
     
     return html_content, context
 
 def convert_html_to_md(html_content, context):
+    # A fresh converter per document: HTML2Text keeps parser state (open lists, blockquotes,
+    # links) across handle() calls, so a shared instance leaks it into the next file
     h = html2text.HTML2Text()
     h.ignore_links = False  # Set to True to ignore links
     h.ignore_images = False  # Set to True to ignore images
     h.ignore_emphasis = False  # Set to True to ignore emphasis (bold, italic)
-    h.ignore_emphasis = False  # Set to True to ignore emphasis (bold, italic)
     
     # New logic: Default is to bypass tables (True), unless file is in use_markdown_tables list
     use_markdown_tables_list = context.get('rules', {}).get('use_markdown_tables', [])
@@ -572,48 +820,50 @@ def convert_html_to_md(html_content, context):
     # This prevents '# of ...' from being interpreted as H1 headers
     if h.bypass_tables:
         # Escape '# of' at the start of a line
-        markdown_content = re.sub(r'(?m)^# of', r'\\# of', markdown_content)
+        markdown_content = _METRIC_H1_RE.sub(r'\\# of', markdown_content)
 
     return markdown_content, context
 
 def process_handlebars_templates(html_content, context):
+    if 'text/x-handlebars-template' not in html_content:
+        return html_content, context
+
     hb_context = context.get('hb', {})
-    logging.debug(f'Processing with Handlebars Context: {hb_context}')
-    handlebars_pattern = re.compile(r'<script[^>]*type="text/x-handlebars-template"[^>]*>(.*?)</script>', re.DOTALL)
-    matches = handlebars_pattern.findall(html_content)            
-    for match in matches:
-        logging.debug(f'Found Handlebars template: {match}')
+    logging.debug('Processing with Handlebars Context: %s', hb_context)
+
+    def render(script_match):
+        match = script_match.group(1)
+        logging.debug('Found Handlebars template: %s', match)
         try:
             rendered_content = render_handlebars_template(match, hb_context)
         except Exception as e:
             if 'bad escape' in str(e):
-                logging.debug(f"trying to find template keys")
+                logging.debug("trying to find template keys")
                 # try to manually handle potential template strings
-                # construct a regex to match {{x}} kind of strings and collect all the keys
-                template_keys = re.findall(r'\{\{([a-zA-Z0-9_]+)\}\}', match)
-                # for each key, replace {{key}} with context[key]
-                # if key is not found in context, replace with ''
-                for key in template_keys:
-                    value = hb_context.get(key, '')
-                    match = re.sub(r'\{\{' + key + r'\}\}', value, match)
-                rendered_content = match
+                # replace every {{key}} with context[key] in a single pass
+                # if key is not found in context, replace with ''; non-string values (numbers,
+                # booleans from templateData.js) are rendered with str()
+                rendered_content = _HB_KEY_RE.sub(lambda m: str(hb_context.get(m.group(1), '')), match)
             else:
                 raise e
+        # The rendered content is expanded as a replacement template (as it was when passed
+        # to sub() directly); sanitize_input_html relies on this to unescape \\w and friends.
         try:
-            html_content = handlebars_pattern.sub(rendered_content, html_content, count=1)
+            return script_match.expand(rendered_content)
         except Exception as e:
-            logging.error(f'Error replacing Handlebars template: {e}')
-            logging.error(f'Rendered content: {rendered_content[49280:49300]}')
-            logging.error(f'Original HTML : {html_content[49280:49300]}')
+            logging.error('Error replacing Handlebars template: %s', e)
+            logging.error('Rendered content: %s', rendered_content[:200])
             raise e
-        
-    logging.debug(f'Processed Handlebars template: {html_content}')
+
+    html_content = _HB_SCRIPT_RE.sub(render, html_content)
     return html_content, context
 
 def add_front_matter(markdown_content, context):
+    # The front matter is kept in the context and written ahead of the content by write_file,
+    # rather than copying the whole document just to prepend a few lines
     title = context.get('title', 'Untitled')
     fm_template = """---\ntitle: {title}\ntype: docs\n---\n"""
-    markdown_content = f"{fm_template.format(title=title)}\n{markdown_content}"
+    context['front_matter_block'] = fm_template.format(title=title)
     return markdown_content, context
 
 def sanitize_input_html(content, context):
@@ -621,16 +871,12 @@ def sanitize_input_html(content, context):
     if context.get('src_file_name') not in sanitize_list:
         return content, context
     
-    sed_command = r"sed -E 's/([^\\])\\w/\1\\\\w/g; s/([^\\])\\c/\1\\\\c/g; s/([^\\])\\l/\1\\\\l/g; s/([^\\])\\k/\1\\\\k/g; s/([^\\])\\s/\1\\\\s/g'"
-    try:
-        # Execute the command and capture the output
-        result = subprocess.run(sed_command, input=content, text=True, capture_output=True, shell=True, check=True)
-        logging.info(f'Sanitized HTML content in file: {context.get("src_file_name")}')
-        sanitized_content = result.stdout
-        return sanitized_content, context
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Error occurred: {e}")
-        raise e
+    # Double the backslash of \w, \c, \l, \k and \s escapes that are not already escaped
+    # so they survive handlebars substitution. Like the sed script this replaced, the
+    # preceding character is never a line break.
+    content = _SANITIZE_RE.sub(r'\\\\\1', content)
+    logging.info('Sanitized HTML content in file: %s', context.get("src_file_name"))
+    return content, context
 
 if __name__=="__main__":
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
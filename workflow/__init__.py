@@ -4,7 +4,7 @@ Workflow package for the AK2MD project.
 This package contains the components for converting Apache Kafka HTML documentation to Markdown.
 """
 
-from workflow.registry import WorkflowStepRegistry
+from workflow.registry import StepPipeline, WorkflowStepRegistry
 from workflow.stages import (
     CloneStage,
     PreProcessStage,
@@ -24,6 +24,7 @@ from workflow.processors import (
 
 __all__ = [
     'WorkflowStepRegistry',
+    'StepPipeline',
     'CloneStage',
     'PreProcessStage',
     'PostProcessStage',
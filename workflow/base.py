@@ -2,7 +2,7 @@
 
 import logging
 from enum import Enum, auto
-from typing import Optional
+from typing import List, Optional
 
 class StageStatus(Enum):
     """Status values for workflow stages"""
@@ -14,6 +14,9 @@ class StageStatus(Enum):
 class WorkflowStage:
     """Base class for all workflow stages"""
     
+    # Names of the stages that must complete successfully before this one can run
+    depends_on: List[str] = []
+    
     def __init__(self, name: str, context: 'WorkflowContext'):
         self.name = name
         self.context = context
@@ -21,6 +21,8 @@ class WorkflowContext:
     output_dir: Optional[Path] = None
     static_dir: Optional[Path] = None
     rules: Optional[dict] = None
+    max_workers: Optional[int] = None
+    incremental: bool = False
     
     def __post_init__(self):
         # Initialize paths
@@ -61,4 +63,10 @@ class WorkflowContext:
         # Load rules
         with open(rules_dest) as f:
             self.rules = yaml.safe_load(f)
-            logger.debug("Loaded rules from process.yaml") 
\ No newline at end of file
+            logger.debug("Loaded rules from process.yaml")
+        
+        # These lists are only used for membership checks (per file / per directory)
+        if self.rules:
+            for key in ('sanitize_list', 'exclude_dirs', 'static_dirs'):
+                if key in self.rules:
+                    self.rules[key] = frozenset(self.rules[key]) 
\ No newline at end of file
@@ -5,7 +5,7 @@ The processors package contains the main processing functionality for the workfl
 from workflow.processors.base import PreProcessFile
 from workflow.processors.directory import PreProcessDirectory
 from workflow.processors.doc_version import ProcessDocVersion
-from workflow.processors.doc_section import ProcessDocSection
+from workflow.processors.doc_section import ProcessDocSection, sweep_stale_removals, wait_for_pending_removals
 from workflow.processors.special_files import (
     ProcessSpecialFiles,
     special_file_processors,
@@ -19,6 +19,8 @@ __all__ = [
     'PreProcessDirectory',
     'ProcessDocVersion',
     'ProcessDocSection',
+    'sweep_stale_removals',
+    'wait_for_pending_removals',
     'ProcessSpecialFiles',
     'special_file_processors',
     'register_special_file_processor',
@@ -2,9 +2,10 @@
 
 import os
 import logging
-from typing import List, Dict, Any
+from typing import Dict, Any
 
-from utils import get_title_from_filename, execute_step, write_file
+from workflow.registry import StepPipeline
+from utils import get_title_from_filename, write_file
 
 logger = logging.getLogger('ak2md-workflow.steps.processor-base')
 
@@ -12,13 +13,13 @@ class PreProcessFile:
     """Process a single HTML file to Markdown"""
     
     def __init__(self, src_file: str, dest_file: str, static_path: str, hb_context: dict, rules: dict, 
-                 steps: List):
+                 pipeline: StepPipeline):
         self.src_file = src_file
         self.dest_file = dest_file
         self.static_path = static_path
         self.hb_context = hb_context
         self.rules = rules
-        self.steps = steps
+        self.pipeline = pipeline
     
     def execute(self) -> bool:
         """Process the file using the specified steps"""
@@ -38,9 +39,7 @@ class PreProcessFile:
             with open(self.src_file, 'r', encoding='utf-8') as html_file:
                 html_content = html_file.read()
             
-            content, context = html_content, context
-            for step in self.steps:
-                content, context = execute_step(step, content, context)
+            content, context = self.pipeline.run(html_content, context)
             
             write_file(self.dest_file, content, context)
             return True
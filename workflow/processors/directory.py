@@ -3,27 +3,87 @@
 import os
 import shutil
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 
-from workflow.registry import WorkflowStepRegistry
+from workflow.registry import StepPipeline, WorkflowStepRegistry
 from workflow.processors.base import PreProcessFile
 from utils import HandleBarsContextBuilder
 
 logger = logging.getLogger('ak2md-workflow.steps.processor-directory')
 
+# (src_file, dest_file, static_path, hb_context)
+FileTask = Tuple[str, str, str, dict]
+
+# Rules and pipeline are the same for every file, so each worker process receives them once
+# through _init_worker instead of with every task
+_worker_rules: Optional[dict] = None
+_worker_pipeline: Optional[StepPipeline] = None
+
+def _init_worker(rules: dict, pipeline: StepPipeline):
+    """Store the shared conversion inputs in a freshly started worker process"""
+    global _worker_rules, _worker_pipeline
+    _worker_rules = rules
+    _worker_pipeline = pipeline
+
+def _process_file_task(task: FileTask) -> bool:
+    """Convert a single HTML file; runs in a worker process"""
+    return PreProcessFile(*task, _worker_rules, _worker_pipeline).execute()
+
 class PreProcessDirectory:
     """Process a directory of HTML files to Markdown"""
     
     def __init__(self, src_dir: str, dest_dir: str, static_path: str, hb: HandleBarsContextBuilder, 
-                 rules: dict, registry: WorkflowStepRegistry):
+                 rules: dict, registry: WorkflowStepRegistry, max_workers: Optional[int] = None,
+                 incremental: bool = False, rules_mtime_ns: int = 0):
         self.src_dir = src_dir
         self.dest_dir = dest_dir
         self.static_path = static_path
         self.hb = hb
         self.rules = rules
         self.registry = registry
+        self.max_workers = max_workers
+        self.incremental = incremental
+        self.rules_mtime_ns = rules_mtime_ns
     
     def execute(self) -> bool:
         """Process the directory and its contents"""
+        # Walk the tree first (creating directories and copying non-HTML files),
+        # then convert the collected HTML files in parallel
+        tasks: List[FileTask] = []
+        if not self._collect(tasks):
+            return False
+        return self._process_files(tasks)
+    
+    def _process_files(self, tasks: List[FileTask]) -> bool:
+        """Convert the collected HTML files, using a process pool when more than one worker is allowed"""
+        if not tasks:
+            return True
+        
+        pipeline = self.registry.get_pre_process_pipeline()
+        if self.max_workers == 1 or len(tasks) == 1:
+            results = [PreProcessFile(*task, self.rules, pipeline).execute() for task in tasks]
+        else:
+            logger.info(f'Converting {len(tasks)} HTML files using up to {self.max_workers or os.cpu_count()} workers')
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.rules, pipeline)) as executor:
+                results = list(executor.map(_process_file_task, tasks))
+        
+        failed = [task[0] for task, ok in zip(tasks, results) if not ok]
+        for src_file in failed:
+            logger.error(f'Failed to convert HTML file: {src_file}')
+        return not failed
+    
+    def _is_up_to_date(self, src_path: str, dest_path: str) -> bool:
+        """Check if the converted file is newer than both its source and the rules file"""
+        try:
+            dest_mtime = os.stat(dest_path.replace('.html', '.md')).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        return dest_mtime >= max(os.stat(src_path).st_mtime_ns, self.rules_mtime_ns)
+    
+    def _collect(self, tasks: List[FileTask]) -> bool:
+        """Prepare the destination for this directory and collect its HTML files into tasks"""
         if os.path.basename(self.src_dir) in self.rules.get('exclude_dirs', []):
             logger.info(f'Skipping excluded directory: {self.src_dir}')
             return True
@@ -38,7 +98,8 @@ class PreProcessDirectory:
             else:
                 dest_dir = os.path.join(self.static_path, os.path.basename(self.src_dir))
             try:
-                shutil.copytree(self.src_dir, dest_dir, dirs_exist_ok=True)
+                # Source timestamps are not needed in the output, so skip copying metadata
+                shutil.copytree(self.src_dir, dest_dir, dirs_exist_ok=True, copy_function=shutil.copy)
                 return True
             except Exception as e:
                 logger.error(f'Error copying static directory: {self.src_dir}, Error: {e}')
@@ -51,30 +112,36 @@ class PreProcessDirectory:
                     index_file.write('')
                 logger.info(f'Created directory and _index.md: {self.dest_dir}')
             
+            # Handlebars context is resolved once per directory; sibling files share it
+            dir_hb_context = None
+            
             # Process files and subdirectories
-            for item in os.listdir(self.src_dir):
-                src_path = os.path.join(self.src_dir, item)
-                dest_path = os.path.join(self.dest_dir, item)
+            # Read the entries up front so the directory handle is closed before recursing
+            with os.scandir(self.src_dir) as entries:
+                entries = list(entries)
+            for entry in entries:
+                src_path = entry.path
+                dest_path = os.path.join(self.dest_dir, entry.name)
                 
-                if os.path.isdir(src_path):
+                if entry.is_dir():
                     logger.info(f'Processing directory: {src_path}')
                     processor = PreProcessDirectory(
-                        src_path, dest_path, self.static_path, self.hb, self.rules, self.registry
-                    )
-                    if not processor.execute():
-                        return False
-                elif src_path.endswith('.html'):
-                    logger.info(f'Processing HTML file: {src_path}')
-                    processor = PreProcessFile(
-                        src_path, dest_path, self.static_path, 
-                        self.hb.get_context(src_path), self.rules,
-                        self.registry.get_pre_process_steps()
+                        src_path, dest_path, self.static_path, self.hb, self.rules, self.registry,
+                        self.max_workers, self.incremental, self.rules_mtime_ns
                     )
-                    if not processor.execute():
+                    if not processor._collect(tasks):
                         return False
+                elif entry.name.endswith('.html'):
+                    if self.incremental and self._is_up_to_date(src_path, dest_path):
+                        logger.debug(f'Up to date, skipping HTML file: {src_path}')
+                        continue
+                    logger.info(f'Queueing HTML file: {src_path}')
+                    if dir_hb_context is None:
+                        dir_hb_context = self.hb.get_context(src_path)
+                    tasks.append((src_path, dest_path, self.static_path, dir_hb_context))
                 else:
                     try:
-                        shutil.copy2(src_path, dest_path)
+                        shutil.copy(src_path, dest_path)
                         logger.info(f'Copied file: {src_path} to {dest_path}')
                     except Exception as e:
                         logger.error(f'Error copying file: {src_path}, Error: {e}')
@@ -83,4 +150,4 @@ class PreProcessDirectory:
             return True
         except Exception as e:
             logger.error(f'Error processing directory: {self.src_dir}, Error: {e}')
-            return False 
\ No newline at end of file
+            return False 
@@ -1,31 +1,175 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import shutil
+import sys
+import hashlib
 import logging
-from typing import Dict, Any
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
-from workflow.registry import WorkflowStepRegistry
+import utils
+from workflow.registry import StepPipeline, WorkflowStepRegistry
 from utils import execute_step, write_file, update_front_matter, process_markdown_headings, process_markdown_links, split_markdown_by_heading, remove_duplicate_title_heading, fix_malformed_headings
 
 logger = logging.getLogger('ak2md-workflow.steps.processor-doc-section')
 
+ARRANGE_PIPELINE = StepPipeline([
+    update_front_matter,
+    process_markdown_headings,
+    fix_malformed_headings,
+    process_markdown_links,
+    remove_duplicate_title_heading,  # Remove duplicate H1 if it matches title
+])
+
+# (src_file, per-file context)
+ArrangeTask = Tuple[str, dict]
+
+def _arrange_file_task(task: ArrangeTask) -> Tuple[str, dict]:
+    """Run the arrange steps over a single file; may run in a worker process"""
+    src_file, context = task
+    with open(src_file, 'r', encoding='utf-8') as html_file:
+        content = html_file.read()
+    
+    return ARRANGE_PIPELINE.run(content, context)
+
+def _init_arrange_worker(level: int, formatter: Optional[logging.Formatter]):
+    """Mirror the parent's root logging in a worker, which forkserver starts without handlers"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(formatter)
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+
+def create_arrange_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Create the process pool the files of a section are arranged on.
+    
+    The pool is first used from the doc version threads, so its workers come from a
+    forkserver instead of forking a process that has other threads running.
+    """
+    root = logging.getLogger()
+    formatter = root.handlers[0].formatter if root.handlers else None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('forkserver'),
+                               initializer=_init_arrange_worker, initargs=(root.level, formatter))
+
+_removal_threads: List[threading.Thread] = []
+_removal_lock = threading.Lock()
+
+# Name a replaced directory is renamed to before it is deleted: .<name>.old-<uuid hex>
+_REMOVED_DIR_RE = re.compile(r'^\..+\.old-[0-9a-f]{32}$')
+
+def _log_rmtree_error(function, path, exc_info):
+    logger.error(f'Error removing replaced directory entry: {path}, Error: {exc_info[1]}')
+
+def _rmtree(path: str):
+    shutil.rmtree(path, onerror=_log_rmtree_error)
+
+def _remove_dir_in_background(path: str):
+    """Move a directory out of the way and delete it on a background thread"""
+    trash = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.old-{uuid.uuid4().hex}')
+    os.rename(path, trash)
+    thread = threading.Thread(target=_rmtree, args=(trash,), daemon=True)
+    thread.start()
+    with _removal_lock:
+        _removal_threads.append(thread)
+
+def sweep_stale_removals(root: str) -> int:
+    """Delete replaced directories left under root by an interrupted run or a failed delete"""
+    removed = 0
+    for dirpath, dirnames, _ in os.walk(root):
+        for name in [d for d in dirnames if _REMOVED_DIR_RE.match(d)]:
+            dirnames.remove(name)
+            logger.info(f'Removing leftover replaced directory: {os.path.join(dirpath, name)}')
+            _rmtree(os.path.join(dirpath, name))
+            removed += 1
+    return removed
+
+def wait_for_pending_removals():
+    """Block until the directories replaced by ProcessDocSection have been deleted"""
+    with _removal_lock:
+        threads = _removal_threads[:]
+        _removal_threads.clear()
+    for thread in threads:
+        thread.join()
+
+class ArrangeOutputCache:
+    """On-disk cache of arrange-strategy output, used in incremental mode
+    
+    Entries are keyed on the source file (path, mtime, size), the destination path, the
+    mtime of process.yaml and the version of the arrange code (FORMAT_VERSION plus the mtimes
+    of the modules implementing the steps), so editing the interim markdown, the rules or the
+    converter misses the cache.
+    The section directories are still rebuilt on every run and the later post-processing
+    (TOC cleanup, kraft headings, license headers) still runs over the rewritten files.
+    """
+    
+    # Bump when ARRANGE_PIPELINE or the output of its steps changes
+    FORMAT_VERSION = 1
+    
+    def __init__(self, cache_dir: str, rules_mtime_ns: int):
+        self.cache_dir = cache_dir
+        self.rules_mtime_ns = rules_mtime_ns
+        code_mtimes = '-'.join(str(os.stat(module.__file__).st_mtime_ns) for module in (utils, sys.modules[__name__]))
+        self.code_version = f'{self.FORMAT_VERSION}:{code_mtimes}'
+        self.hits = 0
+        self._used = set()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def entry_path(self, src_file: str, dest_file: str) -> str:
+        st = os.stat(src_file)
+        key = f'{src_file}\0{dest_file}\0{st.st_mtime_ns}\0{st.st_size}\0{self.rules_mtime_ns}\0{self.code_version}'
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.md'
+        with self._lock:
+            self._used.add(name)
+        return os.path.join(self.cache_dir, name)
+    
+    def get(self, path: str) -> Optional[str]:
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.hits += 1
+        return content
+    
+    def put(self, path: str, content: str):
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    
+    def prune(self):
+        """Delete the entries that were not looked up during this run"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name not in self._used:
+                os.unlink(entry.path)
+
 class ProcessDocSection:
     """Process a section in a documentation version"""
     
-    def __init__(self, section: dict, context: dict, registry: WorkflowStepRegistry):
+    def __init__(self, section: dict, context: dict, registry: WorkflowStepRegistry,
+                 executor: Optional[Executor] = None, output_cache: Optional[ArrangeOutputCache] = None):
         self.section = section
         self.context = context
         self.registry = registry
+        self.executor = executor
+        self.output_cache = output_cache
     
     def execute(self) -> bool:
         """Process the section using the specified strategy"""
         try:
             self.context["section_dir"] = os.path.join(self.context['output_path'], self.section['name'])
             
-            # Create the section directory
+            # Create the section directory; an existing one is renamed away (a single
+            # syscall) and deleted in the background
             if os.path.exists(self.context["section_dir"]):
-                shutil.rmtree(self.context["section_dir"])
+                _remove_dir_in_background(self.context["section_dir"])
             os.makedirs(self.context["section_dir"])
             
             # Create the _index.md file
@@ -43,7 +187,7 @@ class ProcessDocSection:
             
             # Write index file
             front_matter, _ = update_front_matter("", self.context)
-            with open(index_file, 'w') as file:
+            with open(index_file, 'w', encoding='utf-8') as file:
                 file.write(front_matter)
             
             strategy = self.section["strategy"]
@@ -60,22 +204,17 @@ class ProcessDocSection:
     
     def _execute_arrange_strategy(self) -> bool:
         """Execute the 'arrange' strategy"""
-        steps = [
-            update_front_matter,
-            process_markdown_headings,
-            fix_malformed_headings,
-            process_markdown_links,
-            remove_duplicate_title_heading,  # Remove duplicate H1 if it matches title
-        ]
-        
         # Capture original context values to prevent leakage between files
         original_up_level = self.context.get('up_level', False)
         original_remove_numeric = self.context.get('remove_numeric', False)
         
+        tasks = []
+        dest_files = []
         for w, n in enumerate(self.section["files"], start=1):
-            # Reset context to original values for each file
-            self.context['up_level'] = original_up_level
-            self.context['remove_numeric'] = original_remove_numeric
+            # Each file gets its own copy of the context, starting from the original values
+            file_context = dict(self.context)
+            file_context['up_level'] = original_up_level
+            file_context['remove_numeric'] = original_remove_numeric
             
             # Determine destination file path first
             if "dst_file" in n:
@@ -107,7 +246,7 @@ class ProcessDocSection:
             if is_section_index:
                 logger.info(f'File will be written to section index (_index.md), using section weight: {weight}')
             
-            self.context["template_values"] = template_values
+            file_context["template_values"] = template_values
             src_file = os.path.join(self.context['src_dir'], n['src_file'])
             if not os.path.exists(src_file):
                 logger.info(f'File not found: {src_file}, continuing processing...')
@@ -117,21 +256,39 @@ class ProcessDocSection:
             # These override both global and section-level settings
             # Hierarchy: global defaults → section overrides → file overrides
             if "up_level" in n:
-                self.context["up_level"] = n["up_level"]
+                file_context["up_level"] = n["up_level"]
                 logger.debug(f'File-level override: up_level={n["up_level"]} for {src_file}')
             if "remove_numeric" in n:
-                self.context["remove_numeric"] = n["remove_numeric"]
+                file_context["remove_numeric"] = n["remove_numeric"]
                 logger.debug(f'File-level override: remove_numeric={n["remove_numeric"]} for {src_file}')
                 
             logger.info(f'Processing file: {src_file}, Destination file: {dest_file}')
+            tasks.append((src_file, file_context))
+            dest_files.append(dest_file)
+        
+        # Reuse the output of files that are unchanged since the last run (incremental mode)
+        cache = self.output_cache
+        cache_paths = [cache.entry_path(src_file, dest_file) if cache else None
+                       for (src_file, _), dest_file in zip(tasks, dest_files)]
+        cached = [cache.get(path) if path else None for path in cache_paths]
+        misses = [task for task, content in zip(tasks, cached) if content is None]
+        
+        # The files are independent, so they can be converted in parallel; results are
+        # still written in section order so later files win if destinations collide
+        if self.executor is not None and len(misses) > 1:
+            results = self.executor.map(_arrange_file_task, misses)
+        else:
+            results = map(_arrange_file_task, misses)
+        
+        for (src_file, file_context), dest_file, cache_path, content in zip(tasks, dest_files, cache_paths, cached):
             try:
-                with open(src_file, 'r', encoding='utf-8') as html_file:
-                    content = html_file.read()
-                    
-                for step in steps:
-                    content, self.context = execute_step(step, content, self.context)
-                
-                write_file(dest_file, content, self.context)
+                if content is None:
+                    content, file_context = next(results)
+                    if cache_path:
+                        cache.put(cache_path, content)
+                else:
+                    logger.debug(f'Unchanged since the last run, reusing output for: {src_file}')
+                write_file(dest_file, content, file_context)
             except Exception as e:
                 logger.error(f'Error processing file: {src_file}, Error: {e}')
                 return False
@@ -2,10 +2,11 @@
 
 import os
 import logging
-from typing import Dict, Any
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional
 
 from workflow.registry import WorkflowStepRegistry
-from workflow.processors.doc_section import ProcessDocSection
+from workflow.processors.doc_section import ArrangeOutputCache, ProcessDocSection
 from utils import update_front_matter
 
 logger = logging.getLogger('ak2md-workflow.steps.processor-doc-version')
@@ -14,19 +15,22 @@ class ProcessDocVersion:
     """Process a specific documentation version"""
     
     def __init__(self, version: str, input_path: str, output_path: str, 
-                 rules: dict, registry: WorkflowStepRegistry):
+                 rules: dict, registry: WorkflowStepRegistry, executor: Optional[Executor] = None,
+                 output_cache: Optional[ArrangeOutputCache] = None):
         self.version = version
         self.input_path = input_path
         self.output_path = output_path
         self.rules = rules
         self.registry = registry
+        self.executor = executor
+        self.output_cache = output_cache
     
     def execute(self) -> bool:
         """Process all sections for this documentation version"""
         try:
             version_output_path = os.path.join(self.output_path, self.version)
-            if not os.path.exists(version_output_path):
-                os.makedirs(version_output_path)
+            # Versions are processed concurrently and share parent directories
+            os.makedirs(version_output_path, exist_ok=True)
                 
             # Create version index file
             index_file = os.path.join(version_output_path, '_index.md')
@@ -57,7 +61,7 @@ class ProcessDocVersion:
             }
             
             front_matter, _ = update_front_matter("", context)
-            with open(index_file, 'w') as file:
+            with open(index_file, 'w', encoding='utf-8') as file:
                 file.write(front_matter)
             
             # Process all sections for this version
@@ -84,7 +88,8 @@ class ProcessDocVersion:
                 context["link_updates"] = self.rules.get('link_updates')
                 
                 logger.info(f'Processing section: {section["name"]} in doc directory: {self.version}')
-                processor = ProcessDocSection(section, context, self.registry)
+                processor = ProcessDocSection(section, context, self.registry, executor=self.executor,
+                                              output_cache=self.output_cache)
                 if not processor.execute():
                     success = False
                     logger.error(f"Failed to process section {section['name']} for version {self.version}")
@@ -882,35 +882,3 @@ register_special_file_processor("blog", process_blog)
 register_special_file_processor("cve-list", process_cve_list)
 # Disabled: streams/introduction.md is now handled by StreamsEnhancementStage
 # register_special_file_processor("streams-introduction", process_streams_introduction)
-
-def _remove_redundant_links(content: str) -> str:
-    """Remove redundant navigation links (Previous/Next, Documentation, Kafka Streams)"""
-    import re
-    
-    logger.info("Removing redundant links")
-    
-    # Pattern 1: Remove Previous/Next navigation links
-    # Looking for: [Previous](/path) [Next](/path)
-    prev_next_pattern = re.compile(
-        r'\n\s*\[Previous\]\([^)]+\)\s*\[Next\]\([^)]+\)\s*\n?',
-        re.MULTILINE
-    )
-    content = prev_next_pattern.sub('\n', content)
-    
-    # Pattern 2: Remove the redundant Documentation/Kafka Streams links at the end
-    # Looking for: * [Documentation](/documentation)\n* [Kafka Streams](/streams)
-    redundant_links_pattern = re.compile(
-        r'\n\s*\*\s+\[Documentation\]\([^)]+\)\s*\n\s*\*\s+\[Kafka\s+Streams\]\([^)]+\)\s*\n?',
-        re.MULTILINE | re.IGNORECASE
-    )
-    content = redundant_links_pattern.sub('\n', content)
-    
-    return content
-
-# Register processors
-register_special_file_processor("committers", process_committers) 
-register_special_file_processor("powered-by", process_powered_by)
-register_special_file_processor("blog", process_blog)
-register_special_file_processor("cve-list", process_cve_list)
-# Disabled: streams/introduction.md is now handled by StreamsEnhancementStage
-# register_special_file_processor("streams-introduction", process_streams_introduction) 
\ No newline at end of file
@@ -11,6 +11,15 @@ from typing import List
 
 logger = logging.getLogger('ak2md-workflow.processors.toc-cleaner')
 
+# Pattern: **Table of Contents** followed by bullet lists
+_TOC_RE = re.compile(r'\*\*Table of Contents\*\*\n\n(?:  \* .*\n(?:    \* .*\n)*)*')
+# Pattern: # Configuration parameter reference followed by bullet lists, up to the next "##" heading
+_CONFIG_PARAM_TOC_RE = re.compile(r'(# Configuration parameter reference\n\n)(?:  \* .*\n(?:    \* .*\n)*)+(\n##)')
+# Pattern: Line starting with [SomeText](url) repeated multiple times
+_BREADCRUMBS_RE = re.compile(r'^(\[[\w\s:]+\]\([^\)]+\)\s*){2,}\n\n', re.MULTILINE)
+# Pattern: protocol.md TOC, starting with * Preliminaries and ending before the first real heading
+_PROTOCOL_TOC_RE = re.compile(r'^\s*\*\s+Preliminaries\n(?:^\s+\* .*\n)*', re.MULTILINE)
+
 class TocCleaner:
     """Remove manually created TOC sections from markdown files"""
     
@@ -48,30 +57,33 @@ class TocCleaner:
     def _process_file(self, file_path: Path) -> bool:
         """Process a single markdown file to remove TOC sections"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Read and (if needed) rewrite through a single open
+            with open(file_path, 'r+', encoding='utf-8') as f:
                 content = f.read()
+                
+                original_content = content
+                
+                # Apply all TOC removal patterns
+                content = self._remove_table_of_contents(content)
+                content = self._remove_config_param_reference_toc(content)
+                content = self._remove_table_of_contents(content)
+                content = self._remove_config_param_reference_toc(content)
+                content = self._remove_navigation_breadcrumbs(content)
+                
+                # Specific cleaner for protocol.md manual TOC
+                if "protocol.md" in file_path.name:
+                    content = self._remove_protocol_toc(content)
+                
+                # Only write if content changed
+                if content == original_content:
+                    return False
+                
+                f.seek(0)
+                f.write(content)
+                f.truncate()
             
-            original_content = content
-            
-            # Apply all TOC removal patterns
-            content = self._remove_table_of_contents(content)
-            content = self._remove_config_param_reference_toc(content)
-            content = self._remove_table_of_contents(content)
-            content = self._remove_config_param_reference_toc(content)
-            content = self._remove_navigation_breadcrumbs(content)
-            
-            # Specific cleaner for protocol.md manual TOC
-            if "protocol.md" in file_path.name:
-                content = self._remove_protocol_toc(content)
-            
-            # Only write if content changed
-            if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                logger.debug(f"Modified: {file_path.relative_to(self.output_dir)}")
-                return True
-            
-            return False
+            logger.debug(f"Modified: {file_path.relative_to(self.output_dir)}")
+            return True
             
         except Exception as e:
             logger.error(f"Error processing {file_path}: {e}")
@@ -79,39 +91,25 @@ class TocCleaner:
     
     def _remove_table_of_contents(self, content: str) -> str:
         """Remove **Table of Contents** section with bullet list."""
-        # Pattern: **Table of Contents** followed by bullet lists
-        pattern = r'\*\*Table of Contents\*\*\n\n(?:  \* .*\n(?:    \* .*\n)*)*'
-        return re.sub(pattern, '', content)
+        return _TOC_RE.sub('', content)
     
     def _remove_config_param_reference_toc(self, content: str) -> str:
         """Remove Configuration parameter reference TOC section."""
-        # Pattern: # Configuration parameter reference followed by bullet lists
-        # Match from the heading to the next "##" heading
-        pattern = r'(# Configuration parameter reference\n\n)(?:  \* .*\n(?:    \* .*\n)*)+(\n##)'
         # Keep the heading and the next section marker, remove the list
-        return re.sub(pattern, r'\1\2', content)
+        return _CONFIG_PARAM_TOC_RE.sub(r'\1\2', content)
     
     def _remove_navigation_breadcrumbs(self, content: str) -> str:
         """Remove navigation breadcrumb lines like [Introduction](...) [Run Demo](...) ..."""
-        # Pattern: Line starting with [SomeText](url) repeated multiple times
         # This matches lines with 2 or more consecutive markdown links
-        pattern = r'^(\[[\w\s:]+\]\([^\)]+\)\s*){2,}\n\n'
-        return re.sub(pattern, '', content, flags=re.MULTILINE)
+        return _BREADCRUMBS_RE.sub('', content)
 
     def _remove_protocol_toc(self, content: str) -> str:
         """Remove manual TOC from protocol.md files."""
         # The TOC in protocol.md usually looks like a list starting with specific sections
         # We'll use a regex that matches the structure described by the user
-        
-        # Pattern to match the specific TOC structure in protocol.md
-        # It typically starts with * Preliminaries and ends before the first real heading
-        pattern = r'^\s*\*\s+Preliminaries\n(?:^\s+\* .*\n)*'
-        
-        # Check if we find the start of the TOC
-        if re.search(pattern, content, re.MULTILINE):
+        content, count = _PROTOCOL_TOC_RE.subn('', content)
+        if count:
             logger.info("Found protocol.md manual TOC pattern, removing it")
-            return re.sub(pattern, '', content, flags=re.MULTILINE)
-            
         return content
 
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import logging
-from typing import Optional, List, Callable, Dict, Any, Tuple
+from typing import Optional, List, Callable, Dict, Any, Iterable, Tuple
 
 # Import the functions from utils
 from utils import (
@@ -23,12 +23,35 @@ logger = logging.getLogger('ak2md-workflow.registry')
 # Define step function type
 StepFunction = Callable[[str, Dict[str, Any]], Tuple[str, Dict[str, Any]]]
 
+class StepPipeline:
+    """An ordered sequence of steps, built once and run over many documents"""
+    
+    __slots__ = ('steps',)
+    
+    def __init__(self, steps: Iterable[StepFunction]):
+        self.steps: Tuple[StepFunction, ...] = tuple(steps)
+    
+    def __len__(self) -> int:
+        return len(self.steps)
+    
+    def run(self, content: str, context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Feed content and context through every step in order"""
+        step = None
+        try:
+            for step in self.steps:
+                content, context = step(content, context)
+        except Exception as e:
+            logger.error('Error executing step %s: %s', step.__name__, e, exc_info=True)
+            raise
+        return content, context
+
 class WorkflowStepRegistry:
     """Registry of workflow steps that can be composed into stages"""
     
     def __init__(self):
         self.pre_process_steps: Dict[str, StepFunction] = {}
         self.post_process_steps: Dict[str, StepFunction] = {}
+        self._pre_process_pipeline: Optional[StepPipeline] = None
         self._register_all_steps()
     
     def _register_all_steps(self):
@@ -51,6 +74,7 @@ class WorkflowStepRegistry:
     def register_pre_process_step(self, name: str, step_func: StepFunction):
         """Register a pre-process step"""
         self.pre_process_steps[name] = step_func
+        self._pre_process_pipeline = None
         logger.debug(f"Registered pre-process step: {name}")
     
     def register_post_process_step(self, name: str, step_func: StepFunction):
@@ -74,6 +98,12 @@ class WorkflowStepRegistry:
         
         return [self.pre_process_steps[name] for name in step_names]
     
+    def get_pre_process_pipeline(self) -> StepPipeline:
+        """Get the default pre-process steps as a pipeline (built once and reused)"""
+        if self._pre_process_pipeline is None:
+            self._pre_process_pipeline = StepPipeline(self.get_pre_process_steps())
+        return self._pre_process_pipeline
+    
     def get_post_process_steps(self, step_names: Optional[List[str]] = None) -> List[StepFunction]:
         """Get post-process steps by name or all if names not provided"""
         if step_names is None:
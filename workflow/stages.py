@@ -2,6 +2,7 @@
 
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Dict
 from pathlib import Path
 
@@ -12,8 +13,11 @@ from workflow.processors import (
     ProcessDocVersion,
     ProcessSpecialFiles,
     special_file_processors,
-    TocCleaner
+    TocCleaner,
+    sweep_stale_removals,
+    wait_for_pending_removals
 )
+from workflow.processors.doc_section import ArrangeOutputCache, create_arrange_executor
 from workflow.processors.special_files import (
     _transform_youtube_to_carousel,
     _transform_use_cases_to_cards,
@@ -99,6 +103,8 @@ class CloneStage(WorkflowStage):
 class PreProcessStage(WorkflowStage):
     """Converts HTML to Markdown"""
     
+    depends_on = ["clone"]
+    
     def _do_execute(self) -> bool:
         try:
             # Build HandleBars context
@@ -110,13 +116,18 @@ class PreProcessStage(WorkflowStage):
             
             # Process the input directory
             self.logger.info("Starting HTML to Markdown conversion using granular workflow steps")
+            if self.context.incremental:
+                self.logger.info("Incremental mode: skipping HTML files whose markdown output is up to date")
             processor = PreProcessDirectory(
                 src_dir=str(self.context.source_dir),
                 dest_dir=str(self.context.interim_dir),
                 static_path=str(self.context.static_dir),
                 hb=hb,
                 rules=self.context.rules,
-                registry=registry
+                registry=registry,
+                max_workers=self.context.max_workers,
+                incremental=self.context.incremental,
+                rules_mtime_ns=(self.context.workspace_dir / "process.yaml").stat().st_mtime_ns
             )
             
             result = processor.execute()
@@ -131,6 +142,8 @@ class PreProcessStage(WorkflowStage):
 class PostProcessStage(WorkflowStage):
     """Restructures and reformats the Markdown"""
     
+    depends_on = ["pre-process"]
+    
     def _do_execute(self) -> bool:
         try:
             # Initialize step registry
@@ -138,21 +151,43 @@ class PostProcessStage(WorkflowStage):
             
             self.logger.info("Starting Markdown restructuring using granular workflow steps")
             
-            # Process each doc version
-            success = True
-            for version in self.context.rules.get('doc_dirs', []):
-                self.logger.info(f"Processing documentation version: {version}")
-                processor = ProcessDocVersion(
-                    version=version,
-                    input_path=str(self.context.interim_dir),
-                    output_path=str(self.context.output_dir / "content" / "en"),
-                    rules=self.context.rules,
-                    registry=registry
+            # Process the doc versions concurrently. Versions write to separate directories,
+            # but the sections within a version stay sequential because they can be nested
+            # (e.g. streams and streams/developer-guide). The files of a section are converted
+            # on a shared process pool unless a single worker was requested.
+            versions = self.context.rules.get('doc_dirs', [])
+            # Directories replaced by an earlier run that never finished deleting them would
+            # otherwise be rescanned below and synced along with the version. They only ever
+            # sit next to section directories, so the static/javadoc trees are not walked.
+            for version in versions:
+                version_dir = self.context.output_dir / "content" / "en" / version
+                if version_dir.exists():
+                    sweep_stale_removals(str(version_dir))
+            executor = create_arrange_executor(self.context.max_workers) if self.context.max_workers != 1 else None
+            output_cache = None
+            if self.context.incremental:
+                self.logger.info("Incremental mode: reusing the restructured output of unchanged files")
+                output_cache = ArrangeOutputCache(
+                    str(self.context.workspace_dir / ".ak2md_cache" / "post-process"),
+                    rules_mtime_ns=(self.context.workspace_dir / "process.yaml").stat().st_mtime_ns
                 )
-                
-                if not processor.execute():
-                    self.logger.error(f"Failed to process documentation version: {version}")
-                    success = False
+            try:
+                if executor is None or len(versions) < 2:
+                    results = [self._process_doc_version(version, registry, executor, output_cache) for version in versions]
+                else:
+                    with ThreadPoolExecutor(max_workers=self.context.max_workers) as version_executor:
+                        results = list(version_executor.map(
+                            lambda version: self._process_doc_version(version, registry, executor, output_cache), versions))
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+                # Replaced section directories must be gone before the output is scanned
+                wait_for_pending_removals()
+            success = all(results)
+            
+            if output_cache is not None and success:
+                self.logger.info(f"Reused the cached output of {output_cache.hits} files")
+                output_cache.prune()
             
             # Clean TOC from all markdown files
             if success:
@@ -188,6 +223,24 @@ class PostProcessStage(WorkflowStage):
             self.logger.error(f"Post-processing failed: {str(e)}")
             return False
     
+    def _process_doc_version(self, version: str, registry: WorkflowStepRegistry, executor, output_cache) -> bool:
+        """Restructure a single documentation version"""
+        self.logger.info(f"Processing documentation version: {version}")
+        processor = ProcessDocVersion(
+            version=version,
+            input_path=str(self.context.interim_dir),
+            output_path=str(self.context.output_dir / "content" / "en"),
+            rules=self.context.rules,
+            registry=registry,
+            executor=executor,
+            output_cache=output_cache
+        )
+        
+        if not processor.execute():
+            self.logger.error(f"Failed to process documentation version: {version}")
+            return False
+        return True
+    
     def _process_kraft_files(self) -> bool:
         """Process kraft.md files to adjust heading levels for migration section"""
         try:
@@ -253,6 +306,9 @@ class PostProcessStage(WorkflowStage):
                 
                 # Write the processed content back to the file
                 processed_content = '\n'.join(processed_lines)
+                if processed_content == content:
+                    self.logger.info(f"No heading changes needed in {kraft_file}")
+                    continue
                 with open(kraft_file, 'w', encoding='utf-8') as f:
                     f.write(processed_content)
                 
@@ -502,6 +558,10 @@ class PostProcessStage(WorkflowStage):
 class ProcessSpecialFilesStage(WorkflowStage):
     """Stage for processing special files with custom logic"""
     
+    # Special files write into output/content, which post-processing rebuilds and rescans
+    # (TOC cleanup, license headers), so the two can't overlap
+    depends_on = ["post-process"]
+    
     def __init__(self, name: str, context: 'WorkflowContext', special_files: List[Dict[str, str]]):
         super().__init__(name, context)
         self.special_files = special_files or []
@@ -513,6 +573,7 @@ class ProcessSpecialFilesStage(WorkflowStage):
             
             self.logger.debug(f"Processing {len(self.special_files)} special files")
             
+            processors = []
             for special_file in self.special_files:
                 file_name = special_file.get('file')
                 processor = special_file.get('processor')
@@ -535,17 +596,22 @@ class ProcessSpecialFilesStage(WorkflowStage):
                 
                 self.logger.debug(f"Input path for {file_name}: {input_path}")
                 
-                processor_obj = ProcessSpecialFiles(
+                processors.append(ProcessSpecialFiles(
                     file_name=file_name,
                     input_path=input_path,
                     output_path=str(self.context.output_dir),
                     processor_name=processor,
                     registry=special_file_processors
-                )
-                
-                if not processor_obj.execute():
-                    self.logger.error(f"Failed to process special file: {file_name}")
-                    success = False
+                ))
+            
+            # Each special file produces its own outputs, so they are processed concurrently
+            if processors:
+                with ThreadPoolExecutor(max_workers=len(processors)) as executor:
+                    futures = {executor.submit(processor_obj.execute): processor_obj for processor_obj in processors}
+                    for future in as_completed(futures):
+                        if not future.result():
+                            self.logger.error(f"Failed to process special file: {futures[future].file_name}")
+                            success = False
             
             return success
         except Exception as e:
@@ -555,6 +621,9 @@ class ProcessSpecialFilesStage(WorkflowStage):
 class StreamsEnhancementStage(WorkflowStage):
     """Enhances Kafka Streams documentation with carousel, cards, and tabbed code"""
     
+    # Reads the post-processed streams pages and data/testimonials.json from special-files
+    depends_on = ["post-process", "special-files"]
+    
     def _do_execute(self) -> bool:
         try:
             streams_config = self.context.rules.get('streams_enhancements', {})
@@ -586,6 +655,7 @@ class StreamsEnhancementStage(WorkflowStage):
                 # Read the post-processed file (has proper front matter already)
                 with open(streams_intro_file, 'r', encoding='utf-8') as f:
                     content = f.read()
+                original_content = content
                 
                 # Load testimonials data
                 testimonials_file = self.context.output_dir / "data" / "testimonials.json"
@@ -612,6 +682,9 @@ class StreamsEnhancementStage(WorkflowStage):
                     continue
                 
                 # Write back the processed content
+                if content == original_content:
+                    self.logger.info(f"streams/introduction.md for version {version} is already enhanced")
+                    continue
                 with open(streams_intro_file, 'w', encoding='utf-8') as f:
                     f.write(content)
                 
@@ -628,6 +701,8 @@ class StreamsEnhancementStage(WorkflowStage):
 class ValidationStage(WorkflowStage):
     """Validates the generated output"""
     
+    depends_on = ["post-process", "special-files", "streams-enhancements"]
+    
     def _do_execute(self) -> bool:
         # Basic validation checks
         if not self.context.output_dir.exists():